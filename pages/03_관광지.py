@@ -1,58 +1,223 @@
 import streamlit as st
 import folium
+from folium.plugins import FastMarkerCluster
 from streamlit_folium import st_folium
-from geopy.distance import geodesic
-
-# 관광지 데이터
-tourist_spots = [
-    {"name": "경복궁", "lat": 37.579617, "lon": 126.977041,
-     "desc": "조선 시대의 대표 궁궐로 외국인들이 가장 많이 찾는 역사 명소!",
-     "subway": "경복궁역"},
-    {"name": "명동 쇼핑거리", "lat": 37.563757, "lon": 126.985302,
-     "desc": "쇼핑과 길거리 음식의 천국! 관광객 필수 코스 🎉",
-     "subway": "명동역"},
-    {"name": "남산타워(N Seoul Tower)", "lat": 37.551169, "lon": 126.988227,
-     "desc": "서울 전망을 한눈에! 야경 명소로 유명 🌃",
-     "subway": "명동역 / 충무로역"},
-    {"name": "동대문디자인플라자(DDP)", "lat": 37.566491, "lon": 127.009221,
-     "desc": "자하 하디드가 설계한 미래형 건축물 + 야시장까지 즐길 수 있음",
-     "subway": "동대문역사문화공원역"},
-    {"name": "북촌한옥마을", "lat": 37.582604, "lon": 126.983998,
-     "desc": "한옥 골목을 걸으며 한국 전통 문화를 느낄 수 있는 곳",
-     "subway": "안국역"},
-    {"name": "홍대거리", "lat": 37.556332, "lon": 126.922651,
-     "desc": "젊음과 예술의 거리! 클럽, 맛집, 버스킹 🎸",
-     "subway": "홍대입구역"},
-    {"name": "롯데월드", "lat": 37.511028, "lon": 127.098091,
-     "desc": "도심 속 대형 테마파크! 실내외 모두 즐길 수 있어요 🎢",
-     "subway": "잠실역"},
-    {"name": "청계천", "lat": 37.570178, "lon": 126.988229,
-     "desc": "도심 속 휴식 공간! 산책하기 좋은 하천길 🚶🏻‍♂️",
-     "subway": "종각역 / 종로3가역"},
-    {"name": "코엑스", "lat": 37.511634, "lon": 127.059537,
-     "desc": "아쿠아리움부터 별마당 도서관까지! 볼거리가 많아요 📚",
-     "subway": "삼성역"},
-    {"name": "한강공원", "lat": 37.520817, "lon": 126.939472,
-     "desc": "서울 시민의 힐링 스팟 🌊 피크닉과 야경의 조화!",
-     "subway": "여의나루역"}
-]
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# 관광지 데이터 파일 (name, lat, lon, desc, subway)
+SPOTS_PATH = Path(__file__).resolve().parent.parent / "tourist_spots.csv"
+
+EARTH_RADIUS_M = 6_371_000
+
+# 클릭 위치 주변에 함께 보여줄 관광지 수
+NEAREST_K = 3
+
+# 격자 한 칸 크기 (위/경도 도 단위, 0.01도 ≈ 1km)
+GRID_DEG = 0.01
+
+# 첫 화면처럼 지도 범위를 아직 모를 때 쓰는 서울 전체 범위 (남, 서, 북, 동)
+DEFAULT_BOUNDS = (37.42, 126.76, 37.70, 127.18)
+
+
+def haversine_m(lat, lon, lats, lons):
+    """한 지점과 여러 지점 사이 거리(m)를 한 번에 계산 (입력은 도 단위)"""
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+class PoiStore:
+    """
+    관광지(POI) 좌표 배열 + 격자 인덱스
+    - 좌표는 NumPy 배열, 화면에 보여줄 정보(name/desc/subway)는 DataFrame
+    - (행, 열) 칸 순으로 정렬된 POI 번호와 칸별 (시작, 개수) 구간으로 빠르게 조회
+    """
+
+    def __init__(self, spots, grid_deg=GRID_DEG):
+        self.spots = spots.reset_index(drop=True)
+        self.grid_deg = grid_deg
+
+        self.lat = self.spots["lat"].to_numpy(dtype=float)
+        self.lon = self.spots["lon"].to_numpy(dtype=float)
+
+        # (행, 열) 칸 번호를 그대로 정렬 (서경·남위처럼 음수 칸도 그대로 유지)
+        cy, cx = self._cell(self.lat), self._cell(self.lon)
+        self.order = np.lexsort((cx, cy))
+        cells, self.cell_start, self.cell_count = np.unique(
+            np.column_stack([cy[self.order], cx[self.order]]).reshape(-1, 2),
+            axis=0, return_index=True, return_counts=True
+        )
+        self.cell_y, self.cell_x = cells[:, 0], cells[:, 1]
+
+    def __len__(self):
+        return len(self.spots)
+
+    def _cell(self, deg):
+        return np.floor(np.asarray(deg) / self.grid_deg).astype(np.int64)
+
+    def _candidates(self, south, west, north, east):
+        """범위와 겹치는 격자 칸에 들어 있는 POI 번호 (범위 밖 POI가 섞일 수 있음)"""
+        y0, y1 = self._cell(south), self._cell(north)
+        x0, x1 = self._cell(west), self._cell(east)
+
+        cells = np.flatnonzero(
+            (self.cell_y >= y0) & (self.cell_y <= y1)
+            & (self.cell_x >= x0) & (self.cell_x <= x1)
+        )
+        if len(cells) == 0:
+            return np.array([], dtype=np.int64)
+
+        counts = self.cell_count[cells]
+        total = counts.sum()
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return self.order[np.repeat(self.cell_start[cells], counts) + offsets]
+
+    def bbox(self, south, west, north, east):
+        """지도 범위(남, 서, 북, 동) 안의 POI 번호"""
+        idx = self._candidates(south, west, north, east)
+        inside = (
+            (self.lat[idx] >= south) & (self.lat[idx] <= north)
+            & (self.lon[idx] >= west) & (self.lon[idx] <= east)
+        )
+        return np.sort(idx[inside])
+
+    def _radius_box(self, lat, lon, radius_m):
+        """
+        원을 감싸는 (남, 서, 북, 동) 범위
+        - 극점이나 날짜변경선(경도 ±180)에 걸치면 None → 전체 비교
+        """
+        r = radius_m / EARTH_RADIUS_M
+        dlat = np.degrees(r)
+        if abs(lat) + dlat >= 90:
+            return None
+
+        # 구면 원의 최대 경도 폭: asin(sin r / cos lat)
+        ratio = np.sin(r) / np.cos(np.radians(lat))
+        if ratio >= 1:
+            return None
+
+        dlon = np.degrees(np.arcsin(ratio))
+        if lon - dlon < -180 or lon + dlon > 180:
+            return None
+        return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+    def radius(self, lat, lon, radius_m):
+        """(lat, lon)에서 radius_m 안의 POI 번호와 거리(m), 가까운 순"""
+        box = self._radius_box(lat, lon, radius_m)
+        idx = self._candidates(*box) if box is not None else np.arange(len(self))
+        dist = haversine_m(lat, lon, self.lat[idx], self.lon[idx])
+
+        inside = dist <= radius_m
+        idx, dist = idx[inside], dist[inside]
+        order = np.argsort(dist, kind="stable")
+        return idx[order], dist[order]
+
+    def nearest(self, lat, lon, k=NEAREST_K):
+        """
+        가장 가까운 POI k개 (번호, 거리(m)), 가까운 순
+        - 작은 반경부터 두 배씩 넓혀 가며 격자에서 후보를 찾음
+        """
+        k = min(k, len(self))
+        if k == 0:
+            return np.array([], dtype=np.int64), np.array([])
+
+        radius_m = self.grid_deg * 111_000
+        while True:
+            idx, dist = self.radius(lat, lon, radius_m)
+            if len(idx) >= k:
+                return idx[:k], dist[:k]
+            if radius_m > np.pi * EARTH_RADIUS_M:
+                # 지구 반 바퀴보다 넓으면 전체 비교
+                dist = haversine_m(lat, lon, self.lat, self.lon)
+                idx = np.argsort(dist, kind="stable")[:k]
+                return idx, dist[idx]
+            radius_m *= 2
+
+
+@st.cache_resource
+def load_poi_store():
+    """관광지 파일을 읽어서 격자 인덱스를 한 번만 만들기 (모든 세션 공유, 읽기 전용)"""
+    spots = pd.read_csv(SPOTS_PATH, encoding="utf-8-sig")
+    return PoiStore(spots)
+
+
+def map_bounds(map_state):
+    """st_folium이 돌려준 지도 범위 → (남, 서, 북, 동). 없으면 기본 범위"""
+    try:
+        bounds = map_state["bounds"]
+        south_west, north_east = bounds["_southWest"], bounds["_northEast"]
+        box = (south_west["lat"], south_west["lng"], north_east["lat"], north_east["lng"])
+    except (TypeError, KeyError):
+        return DEFAULT_BOUNDS
+
+    if any(v is None for v in box):
+        return DEFAULT_BOUNDS
+    return box
+
 
 st.set_page_config(page_title="Seoul Attractions", layout="wide")
 st.title("🌏 외국인들이 좋아하는 서울 관광지 Top 10")
 
-# 지도 생성
+store = load_poi_store()
+spots = store.spots
+
+# 마커가 이 개수보다 많으면 클러스터 + 벡터(원형) 마커로 가볍게 표시
+CLUSTER_THRESHOLD = 50
+
+# FastMarkerCluster용 마커 생성 함수: row = [위도, 경도, 이름]
+FAST_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 6, color: "red", fillColor: "red", fillOpacity: 0.8
+    });
+    marker.bindTooltip(row[2]);
+    return marker;
+}
+"""
+
+# 지도 생성 (기본 지도는 항상 같음 → 컴포넌트가 다시 만들어지지 않음)
 m = folium.Map(location=[37.5665, 126.9780], zoom_start=12)
 
-# 마커 추가 + 팝업 유지(시각 정보용)
-for spot in tourist_spots:
-    folium.Marker(
-        location=[spot["lat"], spot["lon"]],
-        tooltip=spot["name"],
-        icon=folium.Icon(color="red", icon="info-sign")
-    ).add_to(m)
+# 직전 실행에서 st_folium이 돌려준 지도 범위 안의 관광지만 마커로 표시
+visible = store.bbox(*map_bounds(st.session_state.get("tourist_map")))
+visible_spots = spots.iloc[visible]
 
-# 지도 렌더링 (현 클릭 좌표 반환)
-map_data = st_folium(m, width=600, height=400)
+markers = folium.FeatureGroup(name="관광지")
+
+if len(visible_spots) > CLUSTER_THRESHOLD:
+    # 관광지가 많으면 마커를 하나씩 만들지 않고 좌표 배열 하나로 전달
+    FastMarkerCluster(
+        data=visible_spots[["lat", "lon", "name"]].values.tolist(),
+        callback=FAST_MARKER_CALLBACK
+    ).add_to(markers)
+else:
+    # 마커 추가 + 팝업 유지(시각 정보용)
+    for spot in visible_spots.itertuples(index=False):
+        folium.Marker(
+            location=[spot.lat, spot.lon],
+            tooltip=spot.name,
+            icon=folium.Icon(color="red", icon="info-sign")
+        ).add_to(markers)
+
+# 지도 렌더링 (현 클릭 좌표 + 지도 범위 반환)
+# 마커는 feature group으로 따로 보내서 지도 전체를 다시 그리지 않고 마커만 교체
+map_data = st_folium(
+    m,
+    key="tourist_map",
+    width=600,
+    height=400,
+    feature_group_to_add=markers,
+    returned_objects=["last_clicked", "bounds"]
+)
+
+st.caption(f"현재 지도 범위 안의 관광지 {len(visible_spots):,}곳 / 전체 {len(spots):,}곳")
 
 st.markdown("---")
 st.subheader("📌 관광지 정보")
@@ -63,21 +228,22 @@ selected_spot = None
 if map_data and map_data.get("last_clicked"):
     clicked_lat = map_data["last_clicked"]["lat"]
     clicked_lon = map_data["last_clicked"]["lng"]
-    clicked_point = (clicked_lat, clicked_lon)
 
-    # 가장 가까운 관광지 찾기
-    min_distance = float("inf")
+    # 가장 가까운 관광지 찾기 (k개를 한 번에)
+    nearest_idx, nearest_dist = store.nearest(clicked_lat, clicked_lon)
 
-    for spot in tourist_spots:
-        dist = geodesic(clicked_point, (spot["lat"], spot["lon"])).meters
-        if dist < min_distance:
-            min_distance = dist
-            selected_spot = spot
+    if len(nearest_idx):
+        selected_spot = spots.iloc[nearest_idx[0]]
 
 # 관광지 정보 출력
-if selected_spot:
+if selected_spot is not None:
     st.markdown(f"### 📍 {selected_spot['name']}")
     st.markdown(f"⭐ {selected_spot['desc']}")
     st.markdown(f"🚇 가까운 지하철역: **{selected_spot['subway']}**")
+
+    if len(nearest_idx) > 1:
+        st.markdown("#### 🧭 클릭한 위치 주변 관광지")
+        for i, dist in zip(nearest_idx, nearest_dist):
+            st.markdown(f"- {spots.iloc[i]['name']} · 약 {dist:,.0f}m")
 else:
     st.info("👆 지도를 클릭하면 가장 가까운 관광지 설명을 여기에 보여드릴게요!")
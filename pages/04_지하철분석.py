@@ -1,43 +1,473 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
+import io
+import json
+import threading
+from collections import OrderedDict
 from pathlib import Path
+from pandas.api.types import union_categoricals
 
 # -----------------------------
-# 데이터 불러오기 함수 (캐시)
+# CSV 스트리밍 읽기 (인코딩 혼합/중복 블록 대응)
 # -----------------------------
-@st.cache_data
+SUBWAY_COLUMNS = ["사용일자", "노선명", "역명", "승차총승객수", "하차총승객수"]
+
+SUBWAY_DTYPES = {
+    "사용일자": "int32",  # YYYYMMDD
+    "노선명": "category",
+    "역명": "category",
+    "승차총승객수": "int32",
+    "하차총승객수": "int32",
+}
+
+# 한 번에 파싱하는 줄 수 (메모리 사용량 상한)
+CHUNK_ROWS = 200_000
+
+# 반복 블록으로 판단하기 전에 이전 블록과 비교할 줄 수
+REPEAT_CHECK_ROWS = 16
+
+ENCODINGS = ["utf-8", "cp949"]
+
+
+def decode_line(raw, encoding):
+    """직전 줄의 인코딩으로 먼저 디코딩하고, 실패하면 다른 인코딩으로 시도"""
+    for enc in [encoding] + [e for e in ENCODINGS if e != encoding]:
+        try:
+            return raw.decode(enc), enc
+        except UnicodeDecodeError:
+            continue
+
+    return raw.decode(encoding, errors="replace"), encoding
+
+
+def parse_chunk(lines):
+    return pd.read_csv(
+        io.StringIO("\n".join(lines)),
+        header=None,
+        names=SUBWAY_COLUMNS,
+        dtype=SUBWAY_DTYPES,
+    )
+
+
+def iter_lines(f):
+    """
+    (시작 바이트 위치, 정리된 줄, 블록 시작 여부)를 차례로 내보내기
+    - UTF-8 / cp949 블록이 섞여 있어도 줄마다 인코딩을 판별
+    - 중간에 반복되는 헤더 줄과 빈 줄은 건너뜀
+    - 블록 시작: 첫 데이터 줄, 헤더 줄이나 인코딩이 바뀐 지점 다음의 첫 데이터 줄
+    """
+    encoding = ENCODINGS[0]
+    pos = f.tell()
+    new_block = True
+
+    for raw in f:
+        start = pos
+        pos += len(raw)
+
+        line, line_encoding = decode_line(raw, encoding)
+        if line_encoding != encoding:
+            new_block = True
+            encoding = line_encoding
+
+        line = line.lstrip("\ufeff").strip()
+        if line.startswith(SUBWAY_COLUMNS[0]):
+            new_block = True
+            continue
+        if not line:
+            continue
+
+        yield start, line, new_block
+        new_block = False
+
+
+def iter_chunks(csv_path, chunk_rows=CHUNK_ROWS):
+    """
+    subway.csv를 줄 단위로 읽어서 chunk_rows 줄씩 정리된 DataFrame으로 내보내기
+    - 앞에서 나온 블록이 (인코딩만 바꿔서) 다시 반복되면 그 부분은 건너뜀
+      : 블록 첫 줄이 이전 블록 첫 줄과 같으면, 이전 블록을 파일에서 다시 읽으며
+        REPEAT_CHECK_ROWS줄 이상 (또는 블록 끝까지) 똑같을 때만 반복으로 판단
+    - 기억하는 것은 블록마다 첫 줄과 위치뿐 → 메모리는 파일 크기와 무관
+    """
+    lines = []
+    block_starts = {}  # 블록 첫 줄 → 처음 나온 바이트 위치
+    replay = None      # 반복으로 의심되는 동안 비교할 이전 블록 줄
+    pending = []       # 비교 중인 (아직 반복으로 확정되지 않은) 줄
+    confirmed = False
+
+    with open(csv_path, "rb") as f, open(csv_path, "rb") as ref:
+        for start, line, new_block in iter_lines(f):
+            if new_block:
+                # 이전 블록이 비교하던 줄까지 모두 같았으면 통째로 반복 → pending 버림
+                replay, pending, confirmed = None, [], False
+
+                first = block_starts.setdefault(line, start)
+                if first != start:
+                    ref.seek(first)
+                    replay = iter_lines(ref)
+
+            if replay is not None:
+                _, expected, _ = next(replay, (None, None, None))
+                if expected == line:
+                    if not confirmed:
+                        pending.append(line)
+                        confirmed = len(pending) >= REPEAT_CHECK_ROWS
+                    continue
+
+                # 달라진 지점부터는 새 데이터 (확정 전이면 비교하던 줄도 되살림)
+                if not confirmed:
+                    lines.extend(pending)
+                replay, pending, confirmed = None, [], False
+
+            lines.append(line)
+
+            if len(lines) >= chunk_rows:
+                yield parse_chunk(lines)
+                lines = []
+
+    if lines:
+        yield parse_chunk(lines)
+
+
+def concat_chunks(chunks):
+    """카테고리 컬럼은 카테고리를 합쳐서(정렬) 이어 붙이기"""
+    if not chunks:
+        return pd.DataFrame({
+            col: pd.Series(dtype=dtype) for col, dtype in SUBWAY_DTYPES.items()
+        })
+
+    columns = {}
+    for col, dtype in SUBWAY_DTYPES.items():
+        parts = [chunk[col] for chunk in chunks]
+        if dtype == "category":
+            columns[col] = union_categoricals(parts, sort_categories=True)
+        else:
+            columns[col] = np.concatenate([part.to_numpy() for part in parts])
+
+    return pd.DataFrame(columns)
+
+
+KEY_COLUMNS = ["사용일자", "노선명", "역명"]
+COUNT_COLUMNS = ["승차총승객수", "하차총승객수"]
+
+
+def aggregate_rows(df):
+    """같은 (날짜, 호선, 역) 행의 승하차 인원 합치기"""
+    return (
+        df.groupby(KEY_COLUMNS, observed=True, sort=False)[COUNT_COLUMNS]
+        .sum()
+        .astype("int32")
+        .reset_index()
+    )
+
+
+def aggregate_chunks(chunks):
+    """청크를 받는 대로 같은 (날짜, 호선, 역)끼리 미리 합쳐서 크기 줄이기"""
+    for chunk in chunks:
+        yield aggregate_rows(chunk)
+
+
+# -----------------------------
+# 데이터 불러오기 함수 (캐시, 모든 세션 공유)
+# -----------------------------
+@st.cache_resource
 def load_data():
+    # 모든 세션이 같은 DataFrame/순위 배열을 공유 (읽기 전용 → 다시 실행할 때 복사하지 않음)
     # pages 폴더 기준으로 한 단계 위(루트 폴더)에 있는 subway.csv 읽기
     base_dir = Path(__file__).resolve().parent.parent
     csv_path = base_dir / "subway.csv"
 
-    df = pd.read_csv(csv_path, encoding="cp949")
+    # 호선/역명은 카테고리(정수 코드), 승하차 인원은 int32로 읽기
+    # 반복 블록은 읽으면서 건너뛰고, 청크마다 바로 집계해서 원본 전체를 메모리에 올리지 않음
+    df = concat_chunks(list(aggregate_chunks(iter_chunks(csv_path))))
+
+    # 여러 청크에 걸친 같은 (날짜, 호선, 역) 합치기
+    if len(df):
+        df = aggregate_rows(df)
+
+    # 날짜 컬럼 처리: 첫 날짜부터 며칠째인지(int16)로 저장
+    # (날짜 종류가 적으므로 고유값만 datetime으로 변환)
+    raw_dates = df["사용일자"].to_numpy()
+    unique_dates = np.unique(raw_dates)
+    dates = pd.to_datetime(unique_dates.astype(str), format="%Y%m%d")
+    base_date = dates.min()
+    day_of = (dates - base_date).days.to_numpy()
+    df["사용일자"] = day_of[np.searchsorted(unique_dates, raw_dates)].astype("int16")
+
+    # (날짜, 호선 코드) → 역 코드/총 이용객수 순위 배열 (한 번만 집계)
+    # 총 이용객수(승차 + 하차)는 집계할 때만 계산하고 컬럼으로 저장하지 않음
+    ranked = (
+        pd.DataFrame({
+            "day": df["사용일자"],
+            "line": df["노선명"].cat.codes,
+            "station": df["역명"].cat.codes,
+            "total": df["승차총승객수"] + df["하차총승객수"],
+        })
+        .groupby(["day", "line", "station"], as_index=False)["total"]
+        .sum()
+        .sort_values(
+            ["day", "line", "total"],
+            ascending=[True, True, False],
+            kind="stable",
+        )
+    )
+
+    cube = {
+        (int(day), int(line)): (
+            group["station"].to_numpy(),
+            group["total"].to_numpy(dtype="int32"),
+        )
+        for (day, line), group in ranked.groupby(["day", "line"], sort=False)
+    }
+    return df, cube, base_date
 
-    # 날짜 컬럼 처리
-    df["사용일자"] = pd.to_datetime(df["사용일자"].astype(str), format="%Y%m%d")
-    # 총 이용객수 (승차 + 하차)
-    df["총이용객수"] = df["승차총승객수"] + df["하차총승객수"]
-    return df
+
+# -----------------------------
+# 기간 분석용 역 × 날짜 행렬 (캐시, 모든 세션 공유)
+# -----------------------------
+# 이동합계 기간(일)
+ROLLING_DAYS = 7
+
+
+def rolling_sum(matrix, window):
+    """
+    모든 행에 대해 한 번에 window일 이동합계 계산
+    (데이터 시작 후 window일이 안 된 날짜는 그때까지의 합계)
+    """
+    result = np.cumsum(matrix, axis=1, dtype=np.float64)
+    if matrix.shape[1] > window:
+        result[:, window:] -= result[:, :-window].copy()
+    return result
+
+
+@st.cache_resource
+def load_matrix():
+    """
+    (호선, 역) 쌍 × 날짜 총 이용객수 행렬을 한 번만 만들기 (모든 세션 공유, 읽기 전용)
+    - pair_lines / pair_stations: 행마다 호선 코드, 역 코드
+    - rolling: 전체 기간 기준 ROLLING_DAYS일 이동합계 (기간을 잘라도 앞쪽 날짜가 비지 않도록)
+    - observed: 실제 데이터가 있는 날짜 여부
+    """
+    df, _, _ = load_data()
+
+    day = df["사용일자"].to_numpy()
+    line = df["노선명"].cat.codes.to_numpy()
+    station = df["역명"].cat.codes.to_numpy()
+    total = (
+        df["승차총승객수"].to_numpy(dtype=np.int64)
+        + df["하차총승객수"].to_numpy(dtype=np.int64)
+    )
+
+    n_stations = len(df["역명"].cat.categories)
+    pair_key = line.astype(np.int64) * n_stations + station
+    pair_keys, pair_idx = np.unique(pair_key, return_inverse=True)
+
+    n_days = int(day.max()) + 1 if len(day) else 0
+    matrix = np.zeros((len(pair_keys), n_days), dtype=np.int64)
+    np.add.at(matrix, (pair_idx, day), total)
+
+    observed = np.zeros(n_days, dtype=bool)
+    observed[day] = True
+
+    pair_lines = (pair_keys // n_stations).astype(np.int32)
+    pair_stations = (pair_keys % n_stations).astype(np.int32)
+    rolling = rolling_sum(matrix, ROLLING_DAYS)
+    return pair_lines, pair_stations, matrix, rolling, observed
+
+
+def make_line_chart(dates, names, values, title, yaxis_title):
+    fig = go.Figure()
+    for name, row in zip(names, values):
+        fig.add_trace(
+            go.Scatter(
+                x=dates,
+                y=row,
+                mode="lines+markers",
+                name=name,
+                hovertemplate="%{x|%Y-%m-%d}<br>" + name + ": %{y:,.0f}명<extra></extra>",
+            )
+        )
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="날짜",
+        yaxis_title=yaxis_title,
+        hovermode="x",
+        margin=dict(l=40, r=40, t=60, b=40),
+    )
+    return fig
+
+
+def show_range_analysis(base_date, min_date, max_date, lines, stations):
+    """여러 날짜 범위에서 역별 일별 추이 / 평일·주말 평균 / 이동합계 보기"""
+    pair_lines, pair_stations, matrix, rolling, observed = load_matrix()
+
+    date_range = st.sidebar.date_input(
+        "기간 선택",
+        value=(min_date, max_date),
+        min_value=min_date,
+        max_value=max_date,
+    )
+
+    # 시작일만 고른 상태에서는 대기
+    if len(date_range) != 2:
+        st.info("기간의 시작일과 종료일을 모두 선택해주세요.")
+        return
+
+    line_options = ["전체 호선"] + list(lines)
+    selected_line = st.sidebar.selectbox("호선 선택", line_options)
+    top_n = st.sidebar.slider("그래프에 표시할 역 수", 3, 20, 10)
+
+    start = (pd.Timestamp(date_range[0]) - base_date).days
+    end = (pd.Timestamp(date_range[1]) - base_date).days + 1
+
+    # -----------------------------
+    # 역 × 날짜 행렬 자르기
+    # -----------------------------
+    if selected_line == "전체 호선":
+        # 여러 호선이 지나는 역은 호선별 값을 역 기준으로 합침
+        sub = np.zeros((len(stations), end - start), dtype=np.int64)
+        np.add.at(sub, pair_stations, matrix[:, start:end])
+        sub_rolling = np.zeros((len(stations), end - start))
+        np.add.at(sub_rolling, pair_stations, rolling[:, start:end])
+        row_stations = np.arange(len(stations))
+    else:
+        rows = pair_lines == lines.get_loc(selected_line)
+        sub = matrix[rows, start:end]
+        sub_rolling = rolling[rows, start:end]
+        row_stations = pair_stations[rows]
+
+    days_observed = observed[start:end]
+    dates = base_date + pd.to_timedelta(np.arange(start, end), unit="D")
+
+    if sub.size == 0 or not days_observed.any():
+        st.warning("선택한 기간과 호선에 해당하는 데이터가 없습니다.")
+        return
+
+    # 기간 합계 기준 상위 역
+    period_total = sub.sum(axis=1)
+    order = np.argsort(-period_total, kind="stable")
+    order = order[period_total[order] > 0]
+    top = order[:top_n]
+    top_names = stations[row_stations[top]]
+
+    # -----------------------------
+    # 일별 이용객수
+    # -----------------------------
+    st.subheader(
+        f"📈 {dates[0].strftime('%Y-%m-%d')} ~ {dates[-1].strftime('%Y-%m-%d')} "
+        f"{selected_line} 상위 {len(top)}개 역 일별 이용객수"
+    )
+    daily = np.where(days_observed, sub[top], np.nan)
+    st.plotly_chart(
+        make_line_chart(dates, top_names, daily, "역별 일별 총 이용객수", "총이용객수(명)"),
+        use_container_width=True,
+    )
+
+    # -----------------------------
+    # 7일 이동합계
+    # -----------------------------
+    st.subheader(f"📊 {ROLLING_DAYS}일 이동합계")
+    if start < ROLLING_DAYS - 1:
+        st.caption(
+            f"※ 데이터 시작일({base_date.strftime('%Y-%m-%d')})부터 {ROLLING_DAYS}일이 안 된 날짜는 "
+            "그날까지의 합계입니다."
+        )
+    st.plotly_chart(
+        make_line_chart(
+            dates, top_names, sub_rolling[top], f"역별 {ROLLING_DAYS}일 이동합계", "이용객수 합계(명)"
+        ),
+        use_container_width=True,
+    )
+
+    # -----------------------------
+    # 평일 / 주말 평균 (모든 역)
+    # -----------------------------
+    weekend = dates.dayofweek.to_numpy() >= 5
+    weekday_days = days_observed & ~weekend
+    weekend_days = days_observed & weekend
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weekday_mean = sub[:, weekday_days].sum(axis=1) / weekday_days.sum()
+        weekend_mean = sub[:, weekend_days].sum(axis=1) / weekend_days.sum()
+
+    summary = pd.DataFrame({
+        "역명": stations[row_stations[order]],
+        "기간 합계(명)": period_total[order],
+        "평일 평균(명)": np.round(weekday_mean[order]),
+        "주말 평균(명)": np.round(weekend_mean[order]),
+    })
+
+    st.subheader("🗓 평일 / 주말 평균 이용객수")
+    st.dataframe(summary, hide_index=True, use_container_width=True)
+
+
+# -----------------------------
+# 순위 그래프 캐시 (모든 세션 공유)
+# -----------------------------
+# 캐시에 보관할 그래프 전체 크기 상한 (직렬화된 JSON 기준)
+FIGURE_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class FigureCache:
+    """
+    (날짜, 호선) → 직렬화된 막대그래프 JSON. 오래 안 쓴 것부터 지워서 크기 상한 유지 (LRU)
+    - 처음 한 번만 그래프를 만들고 직렬화 (약 14ms), 크기도 그 문자열로 계산
+    - 캐시 적중 시 JSON에서 검증 없이 Figure를 다시 만듦 (약 2ms)
+      → st.plotly_chart는 Figure를 받으면 검증을 건너뛰지만 JSON 직렬화는 매번 직접 함
+        (이미 직렬화된 문자열을 그대로 넘기는 방법은 없음)
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()  # key → 그래프 JSON 문자열
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """캐시된 그래프를 Figure로 돌려줌. 없으면 build()로 만들어 한 번만 직렬화해 보관"""
+        with self.lock:
+            spec = self.items.get(key)
+            if spec is not None:
+                self.items.move_to_end(key)
+                return self._figure(spec)
+
+        # 직렬화한 결과를 그대로 보관 → 크기도 이 문자열로 계산
+        spec = build().to_json()
+        nbytes = len(spec)
+
+        with self.lock:
+            if key not in self.items and nbytes <= self.max_bytes:
+                self.items[key] = spec
+                self.total_bytes += nbytes
+
+                while self.total_bytes > self.max_bytes:
+                    _, old = self.items.popitem(last=False)
+                    self.total_bytes -= len(old)
+
+        return self._figure(spec)
+
+    @staticmethod
+    def _figure(spec):
+        # 캐시에 넣을 때 이미 검증된 그래프 → 다시 검증하지 않음 (dict로 넘기면 약 12ms 검증)
+        return go.Figure(json.loads(spec), _validate=False)
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(FIGURE_CACHE_BYTES)
 
 
 def make_bar_chart(df_ranked, selected_date, selected_line):
     # 색상: 1등은 빨간색, 나머지는 파란색 그라데이션
+    # (순위가 내려갈수록 점점 연해지도록 g 값을 70 ~ 190으로 한 번에 계산)
     n = len(df_ranked)
-    colors = []
-
-    for i in range(n):
-        if i == 0:
-            # 1등
-            colors.append("red")
-        else:
-            # 나머지: 파란색 계열 그라데이션
-            # i가 커질수록 점점 연해지도록 설정
-            t = i / (n - 1) if n > 1 else 1  # 0 ~ 1 사이
-            r = 0
-            g = int(70 + t * 120)   # 70 ~ 190
-            b = 255
-            colors.append(f"rgba({r},{g},{b},1.0)")
+    t = np.arange(n) / (n - 1) if n > 1 else np.ones(n)
+    greens = (70 + t * 120).astype(int)
+    colors = [f"rgba(0,{g},255,1.0)" for g in greens]
+    if n:
+        colors[0] = "red"
 
     fig = go.Figure(
         data=[
@@ -77,15 +507,23 @@ def main():
     )
 
     # 데이터 불러오기
-    df = load_data()
+    df, cube, base_date = load_data()
+    lines = df["노선명"].cat.categories
+    stations = df["역명"].cat.categories
 
     # -----------------------------
     # 사이드바: 날짜 & 호선 선택
     # -----------------------------
     st.sidebar.header("🔧 필터 설정")
 
-    min_date = df["사용일자"].min()
-    max_date = df["사용일자"].max()
+    min_date = base_date
+    max_date = base_date + pd.Timedelta(days=int(df["사용일자"].max()))
+
+    mode = st.sidebar.radio("분석 모드", ["하루 순위", "기간 분석"])
+
+    if mode == "기간 분석":
+        show_range_analysis(base_date, min_date, max_date, lines, stations)
+        return
 
     selected_date = st.sidebar.date_input(
         "날짜 선택 (2025년 10월 중 하루)",
@@ -94,27 +532,22 @@ def main():
         max_value=max_date,
     )
 
-    line_options = sorted(df["노선명"].unique())
+    # 카테고리는 이미 정렬되어 있음
+    line_options = list(lines)
     selected_line = st.sidebar.selectbox("호선 선택", line_options)
 
     # -----------------------------
-    # 데이터 필터링
+    # 데이터 조회 (미리 집계된 순위 바로 꺼내기)
     # -----------------------------
-    mask = (df["사용일자"] == pd.to_datetime(selected_date)) & (
-        df["노선명"] == selected_line
-    )
-    df_filtered = df[mask].copy()
+    day = (pd.Timestamp(selected_date) - base_date).days
+    ranked = cube.get((day, lines.get_loc(selected_line)))
 
-    if df_filtered.empty:
+    if ranked is None:
         st.warning("선택한 날짜와 호선에 해당하는 데이터가 없습니다.")
         return
 
-    # 역별 총 이용객수 집계 & 정렬
-    df_ranked = (
-        df_filtered.groupby("역명", as_index=False)["총이용객수"]
-        .sum()
-        .sort_values("총이용객수", ascending=False)
-    )
+    station_codes, totals = ranked
+    df_ranked = pd.DataFrame({"역명": stations[station_codes], "총이용객수": totals})
 
     # -----------------------------
     # 그래프 그리기
@@ -123,7 +556,12 @@ def main():
         f"📊 {selected_date.strftime('%Y-%m-%d')} {selected_line} 역별 총 이용객수 순위"
     )
 
-    fig = make_bar_chart(df_ranked, pd.to_datetime(selected_date), selected_line)
+    # 같은 (날짜, 호선) 그래프는 세션과 상관없이 한 번만 생성·직렬화
+    # (키는 실제 날짜 → 데이터 기간이 바뀌어도 다른 날짜 그래프와 섞이지 않음)
+    fig = get_figure_cache().get_or_build(
+        (pd.Timestamp(selected_date).date(), selected_line),
+        lambda: make_bar_chart(df_ranked, pd.to_datetime(selected_date), selected_line),
+    )
     st.plotly_chart(fig, use_container_width=True)
 
     # -----------------------------
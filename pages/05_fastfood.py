@@ -1,128 +1,309 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import os
 import plotly.express as px
 from pathlib import Path   # ✅ 이 줄 추가!
 
+BASE_DIR = Path(__file__).resolve().parent.parent
+CSV_PATH = BASE_DIR / "fastfood.csv"   # ✅ fastfood.csv는 프로젝트 루트에 있다고 가정
+
+# 정제된 데이터를 저장해 둘 바이너리 캐시 (원본 크기·수정 시각이 같으면 재사용)
+CACHE_DIR = BASE_DIR / ".cache" / "fastfood"
+
+# 정제 규칙이 바뀌면 올려서 예전 캐시를 무시
+SCHEMA_VERSION = 2
+
+# 정규화된 컬럼 이름 → 타입 ("text" / "number")
+FASTFOOD_SCHEMA = {
+    "Company": "text",
+    "Item": "text",
+    "Calories": "number",
+    "Calories from Fat": "number",
+    "Total Fat (g)": "number",
+    "Saturated Fat (g)": "number",
+    "Trans Fat (g)": "number",
+    "Cholesterol (mg)": "number",
+    "Sodium (mg)": "number",
+    "Carbs (g)": "number",
+    "Fiber (g)": "number",
+    "Sugars (g)": "number",
+    "Protein (g)": "number",
+    "Weight Watchers Pnts": "number",
+}
+
+# 없으면 분석할 수 없는 컬럼
+REQUIRED_COLUMNS = ["Company", "Item", "Calories"]
+
+# "5.5 g", "1,200" 같은 값에서 숫자 부분만 추출 ("<5" 같은 미만 표기는 따로 구분)
+NUMBER_PATTERN = r"^(<)?\s*(\d+(?:\.\d+)?)"
+
+
+def normalize_column(name) -> str:
+    """'Total Fat\\n(g)', 'Sodium \\n(mg)' 같은 여러 줄 컬럼 이름 → 공백 하나로 정리"""
+    return " ".join(str(name).split())
+
+
+def is_header_row(values) -> bool:
+    """
+    헤더 줄인지 판단 (값 절반 이상이 스키마 컬럼 이름)
+    - 첫 칸은 앞 줄 데이터에 붙어 있을 수 있어서('McDonaldCompany') 끝부분만 비교
+    """
+    names = [normalize_column(v) for v in values]
+    if not names:
+        return False
+
+    hits = sum(name in FASTFOOD_SCHEMA for name in names[1:])
+    hits += any(names[0].endswith(col) for col in FASTFOOD_SCHEMA)
+    return hits * 2 >= len(names)
+
+
+def parse_number(series: pd.Series) -> pd.Series:
+    """
+    영양 성분 문자열 → float
+    - 단위가 붙은 값('5.5 g')과 천 단위 쉼표는 숫자만 사용
+    - '<5' 처럼 기준치 미만 표기는 실제 값을 알 수 없으므로 NaN
+    - 공백(' ', NBSP) 등 숫자가 없으면 NaN
+    """
+    text = series.astype("string").str.replace(",", "", regex=False).str.strip()
+    parts = text.str.extract(NUMBER_PATTERN)
+
+    values = pd.to_numeric(parts[1], errors="coerce").astype(float)
+    below = parts[0].notna().to_numpy()
+    values[below] = np.nan
+    return values
+
+
+def clean_fastfood(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    header=None, 문자열로 읽은 원본 → 스키마에 맞춘 DataFrame
+    1) 헤더 줄 찾기 (데이터 중간에 끼어 있어도 인식) → 컬럼 이름 정규화
+    2) 그 뒤에 반복되는 헤더 줄은 삭제
+    3) 타입 고정: 텍스트는 공백 정리, 숫자는 parse_number
+    """
+    header_rows = [i for i, row in enumerate(raw.itertuples(index=False)) if is_header_row(row)]
+    if not header_rows:
+        raise ValueError("헤더 줄을 찾을 수 없습니다.")
+
+    header = [normalize_column(v) for v in raw.iloc[header_rows[0]]]
+    # 데이터에 붙어 버린 첫 컬럼 이름 ('McDonaldCompany' → 'Company')
+    header[0] = next((col for col in FASTFOOD_SCHEMA if header[0].endswith(col)), header[0])
+
+    df = raw.drop(index=raw.index[header_rows]).iloc[header_rows[0]:]
+    df.columns = header
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    df = df.dropna(how="all").reset_index(drop=True)
+
+    for col, kind in FASTFOOD_SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if kind == "number":
+            df[col] = parse_number(df[col])
+        else:
+            df[col] = df[col].astype("string").str.strip()
+
+    return df
+
+
+def cache_path(csv_path: Path) -> Path:
+    """원본 크기·수정 시각·스키마 버전이 이름에 들어간 캐시 파일 경로"""
+    stat = csv_path.stat()
+    return CACHE_DIR / f"fastfood-v{SCHEMA_VERSION}-{stat.st_size}-{stat.st_mtime_ns}.pkl"
+
+
 @st.cache_data
 def load_data():
-    # 현재 파일: /mount/src/ai_project/pages/05_fastfood.py
-    # base_dir:  /mount/src/ai_project
-    base_dir = Path(__file__).resolve().parent.parent
-    csv_path = base_dir / "fastfood.csv"   # ✅ fastfood.csv는 프로젝트 루트에 있다고 가정
-
-    if not csv_path.exists():
+    """fastfood.csv를 정제해서 불러오기 (정제 결과는 바이너리 캐시로 재사용)"""
+    if not CSV_PATH.exists():
         st.error(
             f"fastfood.csv 파일을 찾을 수 없습니다.\n"
-            f"다음 위치에 fastfood.csv가 있는지 확인해주세요:\n\n{csv_path}"
+            f"다음 위치에 fastfood.csv가 있는지 확인해주세요:\n\n{CSV_PATH}"
         )
         st.stop()
 
-    df = pd.read_csv(csv_path)
+    cached = cache_path(CSV_PATH)
+    if cached.exists():
+        try:
+            return pd.read_pickle(cached)
+        except Exception:
+            pass   # 깨진 캐시 → 다시 만들기
+
+    raw = pd.read_csv(CSV_PATH, header=None, dtype=str, keep_default_na=False, na_values=[""])
+    try:
+        df = clean_fastfood(raw)
+    except ValueError as e:
+        st.error(f"fastfood.csv 형식이 올바르지 않습니다: {e}")
+        st.stop()
+
+    # 캐시 저장 (실패해도 화면에는 영향 없음), 예전 캐시는 정리
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix(".tmp")
+        df.to_pickle(tmp)
+        os.replace(tmp, cached)
+        for old in CACHE_DIR.glob("fastfood-*.pkl"):
+            if old != cached:
+                old.unlink(missing_ok=True)
+    except OSError:
+        pass
+
     return df
-def add_health_score(df: pd.DataFrame) -> pd.DataFrame:
+
+
+# 나쁠수록 건강에 안 좋은 항목들
+BAD_COLS = [
+    "Calories",
+    "Total Fat (g)",
+    "Saturated Fat (g)",
+    "Trans Fat (g)",
+    "Cholesterol (mg)",
+    "Sodium (mg)",
+    "Carbs (g)",
+    "Sugars (g)",
+]
+
+# 많을수록 좋은 항목들
+GOOD_COLS = [
+    "Fiber (g)",
+    "Protein (g)",
+]
+
+# 가중치 슬라이더에 보여줄 영양소 이름
+NUTRIENT_LABELS = {
+    "Calories": "칼로리",
+    "Total Fat (g)": "총 지방",
+    "Saturated Fat (g)": "포화 지방",
+    "Trans Fat (g)": "트랜스 지방",
+    "Cholesterol (mg)": "콜레스테롤",
+    "Sodium (mg)": "나트륨",
+    "Carbs (g)": "탄수화물",
+    "Sugars (g)": "당류",
+    "Fiber (g)": "식이섬유",
+    "Protein (g)": "단백질",
+}
+
+# 가중치 슬라이더 범위 (기본값 1 = 모든 영양소 동일 비중)
+WEIGHT_MIN, WEIGHT_MAX, WEIGHT_STEP = 0.0, 3.0, 0.5
+
+# 건강한 메뉴로 보여줄 개수
+TOP_K = 3
+
+
+def health_matrix(df: pd.DataFrame):
     """
-    전체 데이터 기준으로 각 영양소를 0~1 사이로 정규화해서
-    'health_score' 컬럼을 추가합니다.
+    영양소 컬럼들을 한 번에 0~1 점수 행렬로 변환
     - 나쁠수록 안 좋은 것(칼로리, 지방, 나트륨 등): 값이 낮을수록 점수↑
     - 좋을수록 좋은 것(식이섬유, 단백질): 값이 클수록 점수↑
+    - 전부 NaN이거나 값이 모두 같은 컬럼은 정규화 불가 → 제외
+    반환: (점수 행렬 (메뉴 수 × 영양소 수, 값이 없으면 NaN), 사용한 컬럼 목록)
     """
-    df = df.copy()
+    cols = [c for c in BAD_COLS + GOOD_COLS if c in df.columns]
 
-    # 나쁠수록 건강에 안 좋은 항목들
-    bad_cols = [
-        "Calories",
-        "Total Fat\n(g)",
-        "Saturated Fat\n(g)",
-        "Trans Fat\n(g)",
-        "Cholesterol\n(mg)",
-        "Sodium \n(mg)",
-        "Carbs\n(g)",
-        "Sugars\n(g)",
-    ]
+    # 1) (n, m) 행렬 (load_data에서 이미 float로 정제됨)
+    values = df[cols].to_numpy(dtype=float, na_value=np.nan)
 
-    # 많을수록 좋은 항목들
-    good_cols = [
-        "Fiber\n(g)",
-        "Protein\n(g)",
-    ]
+    # 2) 컬럼별 최소/최대를 한 번에 계산
+    with np.errstate(invalid="ignore"):
+        has_data = ~np.isnan(values).all(axis=0)
+        min_v = np.nanmin(np.where(has_data, values, 0.0), axis=0)
+        max_v = np.nanmax(np.where(has_data, values, 0.0), axis=0)
 
-    # 1) 숫자로 강제 변환 (숫자가 아니면 NaN)
-    for col in bad_cols + good_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
+    usable = has_data & (max_v > min_v)
+    values, min_v, max_v = values[:, usable], min_v[usable], max_v[usable]
+    cols = [c for c, ok in zip(cols, usable) if ok]
 
-    score_cols = []
+    # 3) 정규화 + 방향 맞추기 (나쁜 항목은 1 - norm)
+    norm = (values - min_v) / (max_v - min_v)
+    is_bad = np.array([c in BAD_COLS for c in cols], dtype=bool)
+    norm[:, is_bad] = 1.0 - norm[:, is_bad]
 
-    # 2) 나쁠수록 안 좋은 항목: 값이 작을수록 건강 점수↑
-    for col in bad_cols:
-        if col not in df.columns:
-            continue
+    return norm, cols
 
-        col_data = df[col]
 
-        # 전부 NaN이면 스킵
-        if col_data.notna().sum() == 0:
-            continue
+class HealthTable:
+    """
+    영양소 점수 행렬 + 회사별 메뉴 목록
+    - 점수 행렬과 회사별 행 번호는 처음 한 번만 계산
+    - 가중치가 바뀌면 행렬 × 가중치 벡터 한 번으로 점수를 다시 계산
+    """
 
-        min_v = col_data.min(skipna=True)
-        max_v = col_data.max(skipna=True)
+    def __init__(self, df: pd.DataFrame):
+        norm, self.score_cols = health_matrix(df)
 
-        # 값이 하나뿐이거나 모두 같은 값이면 정규화 불가 → 스킵
-        if pd.isna(min_v) or pd.isna(max_v) or min_v == max_v:
-            continue
+        self.df = df.reset_index(drop=True)
 
-        norm = (col_data - min_v) / (max_v - min_v)   # 0~1
-        score = 1 - norm                              # 값이 작을수록 점수↑
+        # 가중 평균용: 값이 없는 칸은 0으로 채운 행렬 + 값이 있는지 표시한 행렬
+        #   점수 = (filled @ w) / (present @ w) → 값이 없는 항목은 빼고 평균
+        self.filled = np.nan_to_num(norm, nan=0.0)
+        self.present = (~np.isnan(norm)).astype(float)
 
-        score_col_name = f"_score_{col}"
-        df[score_col_name] = score
-        score_cols.append(score_col_name)
+        self.companies = sorted(self.df["Company"].dropna().unique())
 
-    # 3) 많을수록 좋은 항목: 값이 클수록 건강 점수↑
-    for col in good_cols:
-        if col not in df.columns:
-            continue
+        # 회사별: 칼로리 순으로 정렬한 메뉴 + 점수 계산용 행 번호
+        self.by_calories = {}
+        self.company_rows = {}
+        for company, rows in self.df.groupby("Company", sort=False).indices.items():
+            company_df = self.df.iloc[rows]
+            self.by_calories[company] = company_df.sort_values(
+                "Calories", ascending=False, kind="stable"
+            )
+            self.company_rows[company] = rows
 
-        col_data = df[col]
+    def scores(self, weights, rows=None):
+        """가중치 벡터로 건강 점수 계산 (rows가 있으면 해당 메뉴만, 계산 불가면 NaN)"""
+        filled, present = self.filled, self.present
+        if rows is not None:
+            filled, present = filled[rows], present[rows]
 
-        if col_data.notna().sum() == 0:
-            continue
+        weights = np.asarray(weights, dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            total = present @ weights
+            return np.where(total > 0, (filled @ weights) / total, np.nan)
 
-        min_v = col_data.min(skipna=True)
-        max_v = col_data.max(skipna=True)
+    def top_k(self, company, weights, k=TOP_K):
+        """회사 메뉴 중 건강 점수 상위 k개 (전체 정렬 없이 argpartition으로 선택)"""
+        rows = self.company_rows.get(company, np.array([], dtype=np.intp))
+        scores = self.scores(weights, rows)
 
-        if pd.isna(min_v) or pd.isna(max_v) or min_v == max_v:
-            continue
+        valid = np.flatnonzero(~np.isnan(scores))
+        if len(valid) == 0:
+            return self.df.iloc[[]].assign(health_score=np.array([], dtype=float))
 
-        score = (col_data - min_v) / (max_v - min_v)  # 값이 클수록 점수↑
+        k = min(k, len(valid))
+        keys = -scores[valid]
+        kth = keys[np.argpartition(keys, k - 1)[k - 1]]
 
-        score_col_name = f"_score_{col}"
-        df[score_col_name] = score
-        score_cols.append(score_col_name)
+        # k번째 점수와 같은 메뉴까지 모두 후보로 남긴 뒤
+        # 점수 내림차순 (같으면 파일 순서)으로 정렬해서 앞의 k개
+        # (argpartition은 동점 중 아무거나 고르므로 경계의 동점을 버리지 않음)
+        picked = valid[keys <= kth]
+        picked = picked[np.lexsort((picked, -scores[picked]))][:k]
 
-    # 4) 개별 스코어 평균 → health_score
-    if score_cols:
-        df["health_score"] = df[score_cols].mean(axis=1, skipna=True)
-    else:
-        df["health_score"] = np.nan
+        top = self.df.iloc[rows[picked]].copy()
+        top["health_score"] = scores[picked]
+        return top
 
-    return df
 
+@st.cache_resource
+def load_health_table():
+    """건강 점수 계산 + 회사별 정렬을 한 번만 수행 (모든 세션 공유, 읽기 전용)"""
+    return HealthTable(load_data())
 
 
 def main():
     st.title("🍟 패스트푸드 영양 분석")
 
-    df = load_data()
-    df = add_health_score(df)
+    table = load_health_table()
 
-    companies = sorted(df["Company"].dropna().unique())
-    selected_company = st.selectbox("📌 회사를 선택하세요", companies)
+    selected_company = st.selectbox("📌 회사를 선택하세요", table.companies)
 
-    company_df = df[df["Company"] == selected_company]
+    company_df = table.by_calories.get(selected_company)
 
-    if company_df.empty:
+    if company_df is None or company_df.empty:
         st.warning("해당 회사의 메뉴가 없습니다.")
         return
 
@@ -130,7 +311,7 @@ def main():
     st.subheader(f"📊 {selected_company} 메뉴별 칼로리")
 
     fig = px.bar(
-        company_df.sort_values("Calories", ascending=False),
+        company_df,
         x="Item",
         y="Calories",
         title=f"{selected_company} 메뉴 칼로리",
@@ -141,32 +322,44 @@ def main():
     st.plotly_chart(fig, use_container_width=True)
 
     # ▣ 건강 점수 Top3 메뉴
-    st.subheader(f"🥗 {selected_company} 건강한 메뉴 TOP 3")
+    st.subheader(f"🥗 {selected_company} 건강한 메뉴 TOP {TOP_K}")
+
+    # 영양소별 가중치 (0이면 해당 영양소는 점수에서 제외)
+    with st.expander("⚖️ 영양소별 가중치 설정"):
+        slider_cols = st.columns(2)
+        weights = [
+            slider_cols[i % 2].slider(
+                NUTRIENT_LABELS.get(col, col),
+                min_value=WEIGHT_MIN,
+                max_value=WEIGHT_MAX,
+                value=1.0,
+                step=WEIGHT_STEP,
+                key=f"weight_{col}",
+            )
+            for i, col in enumerate(table.score_cols)
+        ]
+
+    top3 = table.top_k(selected_company, weights).reset_index(drop=True)
 
-    if "health_score" not in company_df.columns or company_df["health_score"].isna().all():
-        st.write("건강 점수를 계산할 수 있는 데이터가 부족합니다.")
+    if top3.empty:
+        st.write("건강 점수를 계산할 수 있는 데이터가 부족합니다. (가중치가 모두 0인지 확인해주세요)")
         return
 
-    top3 = (
-        company_df.sort_values("health_score", ascending=False)
-        .head(3)
-        .reset_index(drop=True)
-    )
-    top3.insert(0, "순위", [1, 2, 3])
+    top3.insert(0, "순위", range(1, len(top3) + 1))
 
     show_cols = [
         "순위",
         "Item",
         "Calories",
-        "Total Fat\n(g)",
-        "Saturated Fat\n(g)",
-        "Trans Fat\n(g)",
-        "Cholesterol\n(mg)",
-        "Sodium \n(mg)",
-        "Carbs\n(g)",
-        "Fiber\n(g)",
-        "Sugars\n(g)",
-        "Protein\n(g)",
+        "Total Fat (g)",
+        "Saturated Fat (g)",
+        "Trans Fat (g)",
+        "Cholesterol (mg)",
+        "Sodium (mg)",
+        "Carbs (g)",
+        "Fiber (g)",
+        "Sugars (g)",
+        "Protein (g)",
         "health_score",
     ]
     show_cols = [c for c in show_cols if c in top3.columns]
@@ -176,15 +369,15 @@ def main():
     # 숫자 컬럼 포맷팅
     numeric_formats = {
         "Calories": "{:.0f}",
-        "Total Fat\n(g)": "{:.1f}",
-        "Saturated Fat\n(g)": "{:.1f}",
-        "Trans Fat\n(g)": "{:.1f}",
-        "Cholesterol\n(mg)": "{:.0f}",
-        "Sodium \n(mg)": "{:.0f}",
-        "Carbs\n(g)": "{:.1f}",
-        "Fiber\n(g)": "{:.1f}",
-        "Sugars\n(g)": "{:.1f}",
-        "Protein\n(g)": "{:.1f}",
+        "Total Fat (g)": "{:.1f}",
+        "Saturated Fat (g)": "{:.1f}",
+        "Trans Fat (g)": "{:.1f}",
+        "Cholesterol (mg)": "{:.0f}",
+        "Sodium (mg)": "{:.0f}",
+        "Carbs (g)": "{:.1f}",
+        "Fiber (g)": "{:.1f}",
+        "Sugars (g)": "{:.1f}",
+        "Protein (g)": "{:.1f}",
         "health_score": "{:.3f}",
     }
 
@@ -196,7 +389,8 @@ def main():
 
     st.write(
         "※ 건강 점수는 **칼로리·지방·나트륨·당분은 낮을수록**, "
-        "**식이섬유·단백질은 높을수록** 좋다는 기준으로 계산한 상대적인 점수입니다. (0~1 사이)"
+        "**식이섬유·단백질은 높을수록** 좋다는 기준으로 계산한 상대적인 점수를 "
+        "위에서 정한 가중치로 평균한 값입니다. (0~1 사이)"
     )
 
     st.dataframe(top3_display, use_container_width=True)
@@ -2,9 +2,18 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 import folium
-from streamlit_folium import st_folium
+import streamlit.components.v1 as components
+from folium.plugins import FastMarkerCluster
 
 # 지오코딩을 위한 geopy (카페/지하철 위치 좌표 얻기)
 from geopy.geocoders import Nominatim
@@ -25,78 +34,475 @@ def load_data():
     return cafe_df, dessert_df
 
 
-@st.cache_data
-def geocode(address: str):
-    """주소를 위/경도로 변환 (Nominatim 사용, 세션 내 캐시)"""
+# 지오코딩 결과를 저장하는 SQLite 파일 (재시작/다른 서버에서도 재사용)
+# DESSERT_GEOCODE_DB로 다른 파일을 지정 가능 (테스트가 실제 캐시를 건드리지 않도록)
+GEOCODE_DB_PATH = Path(
+    os.environ.get(
+        "DESSERT_GEOCODE_DB",
+        Path(__file__).resolve().parent.parent / ".cache" / "geocode.sqlite3",
+    )
+)
+
+# 미리 조사한 카페 주소 좌표 목록 (주소,위도,경도) → 시작할 때 캐시에 채워 넣음
+# (Nominatim이 상세 주소(층/호수 포함)를 못 찾는 경우가 많아서 직접 입력)
+GAZETTEER_PATH = Path(__file__).resolve().parent.parent / "gazetteer.csv"
+
+# 지오코딩 실패 결과는 이 시간(초)이 지나면 다시 시도
+FAILURE_TTL = 24 * 60 * 60
+
+
+def normalize_address(address: str) -> str:
+    """캐시 키용 주소 정규화 (전각/반각 통일, 공백 정리)"""
+    address = unicodedata.normalize("NFKC", str(address))
+    return " ".join(address.split())
+
+
+def nominatim_geocoder(query: str):
+    """
+    Nominatim으로 실제 지오코딩
+    - 주소를 못 찾으면 None
+    - 시간 초과/네트워크 오류는 예외 그대로 (일시적인 실패는 캐시하지 않도록)
+    """
     geolocator = Nominatim(user_agent="dessert_top_cafe_app")
+    location = geolocator.geocode(query)
+    if location:
+        return location.latitude, location.longitude
+    return None
+
+
+def offline_geocoder(query: str):
+    """
+    네트워크를 쓰지 않는 지오코더 (캐시/가제티어에 있는 카페 주소만 사용, 테스트용)
+    - 항상 예외 → '주소 없음'으로 캐시되지 않아서 나중에 실제 지오코더로 다시 조회됨
+    """
+    raise LookupError(f"오프라인 모드에서는 지오코딩하지 않습니다: {query}")
+
+
+GEOCODERS = {
+    "nominatim": nominatim_geocoder,
+    "offline": offline_geocoder,
+}
+
+
+# 지오코더별 요청 최소 간격(초) — Nominatim 사용 정책: 초당 1회 이하
+GEOCODER_MIN_INTERVAL = {
+    "nominatim": 1.0,
+    "offline": 0.0,
+}
+
+# 동시에 지오코딩하는 최대 스레드 수
+GEOCODE_WORKERS = 4
+
+
+class RateLimiter:
+    """여러 스레드가 함께 써도 요청 시작 간격이 min_interval 이상이 되도록 대기"""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self.next_time = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.min_interval
+
+        if start > now:
+            time.sleep(start - now)
+
+
+@contextmanager
+def closing_commit(conn):
+    """with 블록이 끝나면 커밋하고 연결 닫기"""
     try:
-        location = geolocator.geocode(address)
-        if location:
-            return location.latitude, location.longitude
-    except Exception:
-        pass
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+class GeocodeStore:
+    """
+    정규화된 주소 → 좌표를 SQLite에 영구 저장하는 지오코딩 캐시
+    - 캐시에 없을 때만 geocoder 호출
+    - '주소 없음' 결과는 FAILURE_TTL 동안만 기억 (네트워크 오류는 기억하지 않음)
+    - 디스크에 DB를 만들 수 없으면 프로세스 메모리 DB로 대신 사용
+    """
+
+    CREATE_TABLE = """
+        CREATE TABLE IF NOT EXISTS geocode (
+            query TEXT PRIMARY KEY,
+            lat REAL,
+            lon REAL,
+            source TEXT,
+            updated_at REAL
+        )
+    """
+
+    def __init__(self, db_path, geocoder, gazetteer_path=None, min_interval=0.0):
+        self.db_path = db_path
+        self.uri = False
+        self.geocoder = geocoder
+        self.rate_limiter = RateLimiter(min_interval)
+
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(self.CREATE_TABLE)
+        except (OSError, sqlite3.Error):
+            # 읽기 전용 디스크 등 → 같은 프로세스 안에서 공유되는 메모리 DB
+            # (연결이 하나라도 열려 있어야 유지되므로 keeper 연결을 들고 있음)
+            self.db_path = f"file:geocode-{id(self)}?mode=memory&cache=shared"
+            self.uri = True
+            self.keeper = sqlite3.connect(self.db_path, uri=True, check_same_thread=False)
+            with self._connect() as conn:
+                conn.execute(self.CREATE_TABLE)
+
+        if gazetteer_path is not None and gazetteer_path.exists():
+            self.seed(pd.read_csv(gazetteer_path, encoding="utf-8-sig"))
+
+    def _connect(self):
+        # 스레드마다 따로 연결 (Streamlit 세션은 서로 다른 스레드에서 실행)
+        return closing_commit(sqlite3.connect(self.db_path, timeout=10, uri=self.uri))
+
+    def _write(self, rows):
+        """캐시에 쓰기 (쓰기 실패해도 화면에는 영향 없음)"""
+        try:
+            with self._connect() as conn:
+                conn.executemany("INSERT OR REPLACE INTO geocode VALUES (?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error:
+            pass
+
+    def seed(self, gazetteer_df):
+        """가제티어(주소,위도,경도) 좌표를 캐시에 채워 넣기"""
+        now = time.time()
+        rows = [
+            (normalize_address(addr), float(lat), float(lon), "gazetteer", now)
+            for addr, lat, lon in gazetteer_df[["주소", "위도", "경도"]].itertuples(index=False)
+        ]
+        self._write(rows)
+
+    def lookup_many(self, keys):
+        """
+        캐시에서 정규화된 주소들의 좌표를 한 번에 찾기
+        - 좌표가 있으면 (lat, lon), 유효한 실패 기록이면 None
+        - 캐시에 없거나 실패 기록이 만료된 주소는 결과에서 빠짐
+        """
+        if not keys:
+            return {}
+
+        placeholders = ", ".join("?" * len(keys))
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT query, lat, lon, updated_at FROM geocode WHERE query IN ({placeholders})",
+                    list(keys),
+                ).fetchall()
+        except sqlite3.Error:
+            rows = []
+
+        now = time.time()
+        found = {}
+        for key, lat, lon, updated_at in rows:
+            if lat is not None:
+                found[key] = (lat, lon)
+            elif now - updated_at < FAILURE_TTL:
+                found[key] = None
+        return found
+
+    def store(self, address: str, coords, source: str):
+        lat, lon = coords if coords else (None, None)
+        self._write([(normalize_address(address), lat, lon, source, time.time())])
+
+    def _fetch(self, key):
+        self.rate_limiter.wait()
+        try:
+            coords = self.geocoder(key)
+        except Exception:
+            # 시간 초과/네트워크 오류 → 이번 요청만 실패 처리, 다음에 다시 시도
+            return None
+        self.store(key, coords, "geocoder")
+        return coords
+
+    def geocode_many(self, addresses, max_workers=GEOCODE_WORKERS):
+        """
+        여러 주소를 한 번에 변환
+        - 같은 주소(정규화 기준)는 한 번만 조회
+        - 캐시에 없는 주소만 스레드 풀에서 동시에 지오코딩 (요청 간격은 rate_limiter가 조절)
+        """
+        keys = list(dict.fromkeys(normalize_address(a) for a in addresses))
+        results = self.lookup_many(keys)
+
+        misses = [key for key in keys if key not in results]
+        if misses:
+            workers = max(1, min(max_workers, len(misses)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results.update(zip(misses, pool.map(self._fetch, misses)))
+
+        return {address: results[normalize_address(address)] for address in addresses}
+
+    def geocode(self, address: str):
+        return self.geocode_many([address])[address]
+
+
+@st.cache_resource
+def get_geocode_store():
+    # DESSERT_GEOCODER=offline 이면 네트워크 없이 캐시/가제티어만 사용
+    name = os.environ.get("DESSERT_GEOCODER", "nominatim")
+    return GeocodeStore(
+        GEOCODE_DB_PATH,
+        GEOCODERS[name],
+        GAZETTEER_PATH,
+        min_interval=GEOCODER_MIN_INTERVAL[name],
+    )
+
+
+def geocode(address: str):
+    """주소를 위/경도로 변환 (영구 캐시 우선, 없을 때만 지오코더 호출)"""
+    coords = get_geocode_store().geocode(address)
+    if coords:
+        return coords
     return None, None
 
 
-def get_recent_top_desserts(dessert_df, months: int = 3, top_n: int = 3):
-    """최근 N개월 기준 인기 TOP 디저트 선정 (평균값 기준)"""
-    max_date = dessert_df["날짜"].max()
-    start_date = max_date - pd.DateOffset(months=months)
-    recent = dessert_df[dessert_df["날짜"] >= start_date]
+def geocode_many(addresses):
+    """여러 주소를 한 번에 위/경도로 변환 → {주소: (lat, lon) 또는 (None, None)}"""
+    results = get_geocode_store().geocode_many(addresses)
+    return {
+        address: coords if coords else (None, None)
+        for address, coords in results.items()
+    }
+
+
+# 인기 디저트 집계 기간 선택지 (None = 전체 기간)
+TREND_WINDOWS = {
+    "1주": pd.DateOffset(weeks=1),
+    "1개월": pd.DateOffset(months=1),
+    "3개월": pd.DateOffset(months=3),
+    "6개월": pd.DateOffset(months=6),
+    "1년": pd.DateOffset(years=1),
+    "전체 기간": None,
+}
+
+
+@st.cache_data
+def load_trend_index():
+    """
+    디저트별 누적합 테이블을 한 번만 만들기
+    → 어떤 기간이든 평균을 (끝 누적합 - 시작 누적합) / 개수 로 바로 계산
+    """
+    _, dessert_df = load_data()
+    dessert_df = dessert_df.sort_values("날짜")
+
+    names = [c for c in dessert_df.columns if c != "날짜"]
+    values = dessert_df[names].to_numpy(dtype=float)
+    observed = ~np.isnan(values)
+
+    # 맨 앞에 0 행을 붙여서 [i0, i1) 구간 합 = csum[i1] - csum[i0]
+    csum = np.zeros((len(values) + 1, len(names)))
+    csum[1:] = np.cumsum(np.where(observed, values, 0.0), axis=0)
+    ccount = np.zeros((len(values) + 1, len(names)))
+    ccount[1:] = np.cumsum(observed, axis=0)
+
+    return dessert_df["날짜"].to_numpy(), names, csum, ccount
+
+
+def window_mean(trend_index, start_date, end_date):
+    """[start_date, end_date] 구간의 디저트별 평균 (누적합 차이로 계산)"""
+    dates, _, csum, ccount = trend_index
+    i0 = np.searchsorted(dates, np.datetime64(start_date), side="left")
+    i1 = np.searchsorted(dates, np.datetime64(end_date), side="right")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (csum[i1] - csum[i0]) / (ccount[i1] - ccount[i0])
+
+
+def get_recent_top_desserts(trend_index, window=TREND_WINDOWS["3개월"], top_n: int = 3):
+    """
+    최근 기간 기준 인기 TOP 디저트 선정 (평균값 기준)
+    - 증감률: 바로 앞의 같은 길이 기간 평균 대비 변화율
+    """
+    dates, names, _, _ = trend_index
+    max_date = pd.Timestamp(dates[-1])
+    start_date = pd.Timestamp(dates[0]) if window is None else max_date - window
+
+    mean_values = window_mean(trend_index, start_date, max_date)
 
-    # 날짜 컬럼 제외하고 평균 계산
-    mean_values = recent.drop(columns=["날짜"]).mean().sort_values(ascending=False)
-    top = mean_values.head(top_n)
+    prev_end = start_date - pd.Timedelta(days=1)
+    prev_start = prev_end - (max_date - start_date)
+    prev_values = window_mean(trend_index, prev_start, prev_end)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        growth = (mean_values - prev_values) / prev_values * 100
+
+    order = np.argsort(-np.nan_to_num(mean_values, nan=-np.inf), kind="stable")[:top_n]
+    top = pd.DataFrame(
+        {"평균": mean_values[order], "직전 기간 대비(%)": growth[order]},
+        index=pd.Index([names[i] for i in order], name="디저트"),
+    )
     return top, start_date, max_date
 
 
-def build_cafe_info_dict():
+# -----------------------------
+# 카페 → 가장 가까운 지하철역 (격자 해시 공간 인덱스)
+# -----------------------------
+# 지하철역 좌표 목록 (역명,호선,위도,경도)
+STATIONS_PATH = Path(__file__).resolve().parent.parent / "subway_stations.csv"
+
+# 격자 한 칸 크기 (m)
+STATION_GRID_M = 1000
+
+EARTH_RADIUS_M = 6_371_000
+
+
+class StationIndex:
     """
-    카페별 '가까운 지하철역' 정보 딕셔너리
-    (웹에서 미리 조사해서 하드코딩한 정보)
+    지하철역 좌표를 평면(m)으로 투영해서 격자 칸별로 묶어 둔 인덱스
+    - nearest(): 여러 지점의 가장 가까운 역을 한 번에(벡터 연산으로) 찾기
+    - 주변 3×3 칸만 확인하고, 그 안에서 확실하지 않은 지점만 전체 비교
     """
-    return {
-        "띵베이크샵": {
-            "subway_name": "제기동역",
-            "subway_line": "1호선",
-        },
-        "올더어글리쿠키&트레몽": {
-            "subway_name": "합정역",
-            "subway_line": "2·6호선",
-        },
-        "사이드테이블": {
-            "subway_name": "홍대입구역",
-            "subway_line": "2·경의중앙·공항철도",
-        },
-        "크림시크": {
-            "subway_name": "명동역",
-            "subway_line": "4호선",
-        },
-        "펠트커피 청계천점": {
-            "subway_name": "광화문역",
-            "subway_line": "5호선",
-        },
-        "라에비뉴 성수": {
-            "subway_name": "성수역",
-            "subway_line": "2호선",
-        },
-        "브론시스": {
-            "subway_name": "홍대입구역",
-            "subway_line": "2·경의중앙·공항철도",
-        },
-        "슈밤": {
-            "subway_name": "서울숲역",
-            "subway_line": "수인분당선",
-        },
-        "작당모의": {
-            "subway_name": "홍대입구역",
-            "subway_line": "2·경의중앙·공항철도",
-        },
-        "센트럴사이트 연남점": {
-            "subway_name": "홍대입구역",
-            "subway_line": "2·경의중앙·공항철도",
-        },
-    }
+
+    def __init__(self, stations_df, cell_m=STATION_GRID_M):
+        self.stations = stations_df.reset_index(drop=True)
+        self.cell_m = cell_m
+
+        lat = self.stations["위도"].to_numpy(dtype=float)
+        lon = self.stations["경도"].to_numpy(dtype=float)
+        self.lat0 = np.radians(lat.mean()) if len(lat) else 0.0
+        self.xy = self._project(lat, lon)
+
+        # 칸 번호 순으로 역 정렬 → 칸별 (시작, 끝) 구간
+        keys = self._cell_keys(self.xy)
+        self.order = np.argsort(keys, kind="stable")
+        self.cell_keys, self.cell_start, self.cell_count = np.unique(
+            keys[self.order], return_index=True, return_counts=True
+        )
+
+    def _project(self, lat, lon):
+        # 서울 정도 범위에서는 등장방형 투영으로 충분히 정확
+        x = EARTH_RADIUS_M * np.radians(lon) * np.cos(self.lat0)
+        y = EARTH_RADIUS_M * np.radians(lat)
+        return np.column_stack([x, y])
+
+    def _cells(self, xy):
+        return np.floor(xy / self.cell_m).astype(np.int64)
+
+    @staticmethod
+    def _key(cx, cy):
+        return cx * 1_000_003 + cy
+
+    def _cell_keys(self, xy):
+        cells = self._cells(xy)
+        return self._key(cells[:, 0], cells[:, 1])
+
+    def nearest(self, lats, lons):
+        """각 지점의 가장 가까운 역 번호와 거리(m) 배열 반환"""
+        q = self._project(np.asarray(lats, dtype=float), np.asarray(lons, dtype=float))
+        n = len(q)
+        best_idx = np.full(n, -1)
+        best_dist = np.full(n, np.inf)
+
+        if n == 0 or len(self.stations) == 0:
+            return best_idx, best_dist
+
+        cells = self._cells(q)
+
+        # 1) 주변 3×3 칸 후보와 거리 비교
+        pair_q, pair_s = [], []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                keys = self._key(cells[:, 0] + dx, cells[:, 1] + dy)
+                pos = np.searchsorted(self.cell_keys, keys)
+                pos = np.minimum(pos, len(self.cell_keys) - 1)
+                hit = self.cell_keys[pos] == keys
+                counts = np.where(hit, self.cell_count[pos], 0)
+                starts = self.cell_start[pos]
+
+                total = counts.sum()
+                if total == 0:
+                    continue
+                # 지점마다 후보 역 구간 [start, start + count)를 펼치기
+                qi = np.repeat(np.arange(n), counts)
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                pair_q.append(qi)
+                pair_s.append(self.order[np.repeat(starts, counts) + offsets])
+
+        if pair_q:
+            qi = np.concatenate(pair_q)
+            si = np.concatenate(pair_s)
+            dist = np.hypot(*(q[qi] - self.xy[si]).T)
+
+            # 지점별 최솟값: 거리 순으로 정렬 후 지점별 첫 번째
+            order = np.lexsort((dist, qi))
+            first = np.unique(qi[order], return_index=True)[1]
+            best = order[first]
+            best_idx[qi[best]] = si[best]
+            best_dist[qi[best]] = dist[best]
+
+        # 2) 3×3 칸 안에서 못 찾았거나 칸 크기보다 먼 지점은 전체 역과 비교
+        unsure = best_dist > self.cell_m
+        if unsure.any():
+            diff = q[unsure][:, None, :] - self.xy[None, :, :]
+            dist = np.hypot(diff[..., 0], diff[..., 1])
+            best_idx[unsure] = dist.argmin(axis=1)
+            best_dist[unsure] = dist.min(axis=1)
+
+        return best_idx, best_dist
+
+
+@st.cache_resource
+def load_station_index():
+    stations_df = pd.read_csv(STATIONS_PATH, encoding="utf-8-sig")
+    return StationIndex(stations_df)
+
+
+# 카페 → 지하철역 결과를 다시 계산하는 주기(초)
+# (일시적인 지오코딩 실패는 캐시에 남지 않으므로 이 주기마다 다시 시도)
+CAFE_INFO_TTL = 10 * 60
+
+
+@st.cache_data(ttl=CAFE_INFO_TTL)
+def build_cafe_info_dict(cafe_df):
+    """
+    카페별 좌표 + '가까운 지하철역' 정보 딕셔너리
+    (카페 주소를 지오코딩한 뒤 역 좌표 인덱스에서 한 번에 최근접 역 검색)
+    - 카페 목록이 같으면 다시 실행해도 지오코딩/역 검색을 반복하지 않음
+    - 지도(make_map)도 여기서 찾은 카페 좌표를 그대로 사용
+    """
+    cafes = {}
+    for cafe_col, addr_col in [("카페1", "위치1"), ("카페2", "위치2")]:
+        for cafe_name, address in cafe_df[[cafe_col, addr_col]].itertuples(index=False):
+            if pd.isna(cafe_name) or pd.isna(address):
+                continue
+            cafes.setdefault(cafe_name, str(address))
+
+    coords = geocode_many(list(cafes.values()))
+    located = [
+        (name, coords[address])
+        for name, address in cafes.items()
+        if coords[address][0] is not None
+    ]
+    if not located:
+        return {}
+
+    index = load_station_index()
+    lats, lons = zip(*(latlon for _, latlon in located))
+    station_idx, dist = index.nearest(lats, lons)
+
+    info = {}
+    for (cafe_name, (lat, lon)), i, d in zip(located, station_idx, dist):
+        station = index.stations.iloc[i]
+        info[cafe_name] = {
+            "lat": lat,
+            "lon": lon,
+            "subway_name": station["역명"],
+            "subway_line": station["호선"],
+            "subway_lat": station["위도"],
+            "subway_lon": station["경도"],
+            "distance_m": d,
+        }
+    return info
 
 
 def make_map(cafe_rows, cafe_info_dict):
@@ -104,9 +510,8 @@ def make_map(cafe_rows, cafe_info_dict):
     선택한 디저트에 해당하는 카페 2곳과
     각각 근처 지하철역을 folium 지도에 표시
     """
-    markers = []
-
-    # 카페 마커 좌표 수집
+    # 1) 표시할 카페 모으기 (좌표는 build_cafe_info_dict에서 이미 찾아 둠)
+    cafes = []
     for _, row in cafe_rows.iterrows():
         for cafe_col, addr_col in [("카페1", "위치1"), ("카페2", "위치2")]:
             cafe_name = row[cafe_col]
@@ -115,81 +520,135 @@ def make_map(cafe_rows, cafe_info_dict):
             if pd.isna(cafe_name) or pd.isna(address):
                 continue
 
-            lat, lon = geocode(str(address))
-            if lat is None:
-                continue
-
-            markers.append(
-                {
-                    "type": "cafe",
-                    "name": cafe_name,
-                    "address": address,
-                    "lat": lat,
-                    "lon": lon,
-                }
-            )
+            cafes.append((cafe_name, str(address), cafe_info_dict.get(cafe_name)))
 
-            # 지하철역 정보 있으면 같이 처리
-            info = cafe_info_dict.get(cafe_name)
-            if info:
-                subway_query = f"서울 {info['subway_name']}"
-                slat, slon = geocode(subway_query)
-                if slat is not None:
-                    markers.append(
-                        {
-                            "type": "subway",
-                            "name": f"{info['subway_name']} ({info['subway_line']})",
-                            "lat": slat,
-                            "lon": slon,
-                        }
-                    )
+    # 2) 카페 마커 + 가까운 지하철역 마커 (역 좌표는 역 목록에 있음)
+    markers = []
+    for cafe_name, address, info in cafes:
+        # 주소 좌표를 못 찾은 카페는 지도에서 제외
+        if not info:
+            continue
+
+        markers.append(
+            {
+                "type": "cafe",
+                "name": cafe_name,
+                "address": address,
+                "lat": info["lat"],
+                "lon": info["lon"],
+            }
+        )
+
+        markers.append(
+            {
+                "type": "subway",
+                "name": f"{info['subway_name']} ({info['subway_line']})",
+                "lat": info["subway_lat"],
+                "lon": info["subway_lon"],
+            }
+        )
 
     if not markers:
         st.info("지오코딩에 실패해서 지도를 표시할 수 없습니다. 주소/네트워크를 확인해주세요.")
         return
 
+    # 같은 마커 묶음이면 캐시된 지도 HTML을 그대로 사용
+    marker_rows = tuple(
+        (mkr["type"], mkr["name"], mkr.get("address", ""), mkr["lat"], mkr["lon"])
+        for mkr in markers
+    )
+    components.html(render_map_html(marker_rows), width=800, height=500)
+
+
+# -----------------------------
+# 지도 HTML 생성 (마커 묶음별 캐시)
+# -----------------------------
+# 마커가 이 개수보다 많으면 클러스터 + 벡터(원형) 마커로 가볍게 표시
+CLUSTER_THRESHOLD = 50
+
+MARKER_COLORS = {"cafe": "#3186cc", "subway": "#2ca02c"}
+
+# FastMarkerCluster용 마커 생성 함수: row = [위도, 경도, 툴팁, 팝업, 색상]
+FAST_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 6, color: row[4], fillColor: row[4], fillOpacity: 0.8
+    });
+    marker.bindTooltip(row[2]);
+    marker.bindPopup(row[3]);
+    return marker;
+}
+"""
+
+
+@st.cache_data(max_entries=256)
+def render_map_html(marker_rows):
+    """
+    (종류, 이름, 주소, 위도, 경도) 마커 묶음 → 완성된 folium 지도 HTML
+    - 마커가 적으면 아이콘 마커, 많으면 FastMarkerCluster(벡터 마커 + 클러스터)
+    """
     # 지도 중심 = 마커들의 평균 위치
-    center_lat = sum(m["lat"] for m in markers) / len(markers)
-    center_lon = sum(m["lon"] for m in markers) / len(markers)
+    center_lat = sum(row[3] for row in marker_rows) / len(marker_rows)
+    center_lon = sum(row[4] for row in marker_rows) / len(marker_rows)
 
     m = folium.Map(location=[center_lat, center_lon], zoom_start=13)
 
-    for mkr in markers:
-        if mkr["type"] == "cafe":
-            popup = f"{mkr['name']}<br>{mkr['address']}"
+    if len(marker_rows) > CLUSTER_THRESHOLD:
+        FastMarkerCluster(
+            data=[
+                [lat, lon, name, f"{name}<br>{address}" if address else name, MARKER_COLORS[kind]]
+                for kind, name, address, lat, lon in marker_rows
+            ],
+            callback=FAST_MARKER_CALLBACK,
+        ).add_to(m)
+        return m.get_root().render()
+
+    for kind, name, address, lat, lon in marker_rows:
+        if kind == "cafe":
+            popup = f"{name}<br>{address}"
             folium.Marker(
-                [mkr["lat"], mkr["lon"]],
+                [lat, lon],
                 popup=popup,
-                tooltip=mkr["name"],
+                tooltip=name,
                 icon=folium.Icon(icon="coffee", prefix="fa"),
             ).add_to(m)
         else:  # subway
-            popup = mkr["name"]
+            popup = name
             folium.Marker(
-                [mkr["lat"], mkr["lon"]],
+                [lat, lon],
                 popup=popup,
-                tooltip=mkr["name"],
+                tooltip=name,
                 icon=folium.Icon(icon="train", prefix="fa", color="green"),
             ).add_to(m)
 
-    st_folium(m, width=800, height=500)
+    return m.get_root().render()
 
 
 def main():
-    st.title("최근 3개월 인기 디저트 TOP & 카페 추천 지도")
+    st.title("기간별 인기 디저트 TOP & 카페 추천 지도")
 
-    cafe_df, dessert_df = load_data()
-    cafe_info_dict = build_cafe_info_dict()
+    cafe_df, _ = load_data()
+    trend_index = load_trend_index()
+    cafe_info_dict = build_cafe_info_dict(cafe_df)
 
-    # 최근 3개월 TOP 디저트 계산
-    top_mean, start_date, max_date = get_recent_top_desserts(dessert_df, months=3, top_n=3)
+    window_label = st.radio(
+        "집계 기간",
+        options=list(TREND_WINDOWS),
+        index=list(TREND_WINDOWS).index("3개월"),
+        horizontal=True,
+    )
+
+    # 선택한 기간 TOP 디저트 계산 (누적합으로 바로 계산)
+    top_mean, start_date, max_date = get_recent_top_desserts(
+        trend_index, window=TREND_WINDOWS[window_label], top_n=3
+    )
 
-    st.subheader("최근 3개월 기준 인기 디저트 TOP")
-    st.caption(f"기간: {start_date.date()} ~ {max_date.date()} 기준 (평균값)")
+    st.subheader(f"최근 {window_label} 기준 인기 디저트 TOP")
+    st.caption(f"기간: {start_date.date()} ~ {max_date.date()} 기준 (평균값, 증감률은 직전 같은 길이 기간 대비)")
 
     # 표로 간단히 보여주기
     st.dataframe(
-        top_mean.reset_index().rename(columns={"index": "디저트", 0: "최근 3개월 평균"}),
+        top_mean.round({"평균": 3, "직전 기간 대비(%)": 1}).reset_index(),
         hide_index=True,
     )
 
@@ -224,13 +683,23 @@ def main():
         st.markdown(f"**1. {cafe1}**")
         st.write(addr1)
         if info1:
-            st.write(f"가까운 지하철역: **{info1['subway_name']} ({info1['subway_line']})**")
+            st.write(
+                f"가까운 지하철역: **{info1['subway_name']} ({info1['subway_line']})** "
+                f"· 약 {info1['distance_m']:,.0f}m"
+            )
+        else:
+            st.caption("가까운 지하철역: 주소 좌표를 찾지 못해 표시할 수 없습니다.")
 
     with col2:
         st.markdown(f"**2. {cafe2}**")
         st.write(addr2)
         if info2:
-            st.write(f"가까운 지하철역: **{info2['subway_name']} ({info2['subway_line']})**")
+            st.write(
+                f"가까운 지하철역: **{info2['subway_name']} ({info2['subway_line']})** "
+                f"· 약 {info2['distance_m']:,.0f}m"
+            )
+        else:
+            st.caption("가까운 지하철역: 주소 좌표를 찾지 못해 표시할 수 없습니다.")
 
     st.markdown("---")
     st.subheader("🗺 지도에서 카페 & 지하철역 보기")
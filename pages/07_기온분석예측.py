@@ -1,8 +1,14 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from sklearn.linear_model import LinearRegression
 import numpy as np
+import hashlib
+import io
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
 
 # -----------------------------------
 # 페이지 설정
@@ -18,9 +24,27 @@ st.title("🌡️ 날짜별 기온 분석")
 # -----------------------------------
 # 데이터 불러오기
 # -----------------------------------
-@st.cache_data
-def load_data():
-    df = pd.read_csv("seoul.csv", encoding="cp949")
+BASE_DIR = Path(__file__).resolve().parent.parent
+CSV_PATH = BASE_DIR / "seoul.csv"
+
+# 정제된 데이터를 컬럼별 .npy 파일로 저장해 두는 캐시 폴더
+CACHE_DIR = BASE_DIR / ".cache" / "seoul"
+
+CACHE_COLUMNS = [
+    "date",
+    "station",
+    "avg_temp",
+    "min_temp",
+    "max_temp",
+    "year",
+    "month",
+    "day"
+]
+
+
+def parse_csv(source, header="infer"):
+    # source: 파일 경로 또는 (이어 붙은 부분만 담은) 바이트 버퍼
+    df = pd.read_csv(source, encoding="cp949", header=header)
 
     # 컬럼명 변경
     df.columns = [
@@ -50,15 +74,11 @@ def load_data():
     df = df.dropna(subset=["date"])
 
     # 숫자 변환
-    df["min_temp"] = pd.to_numeric(
-        df["min_temp"],
-        errors="coerce"
-    )
-
-    df["max_temp"] = pd.to_numeric(
-        df["max_temp"],
-        errors="coerce"
-    )
+    for col in ["station", "avg_temp", "min_temp", "max_temp"]:
+        df[col] = pd.to_numeric(
+            df[col],
+            errors="coerce"
+        )
 
     # 결측 제거
     df = df.dropna(
@@ -70,10 +90,496 @@ def load_data():
     df["month"] = df["date"].dt.month
     df["day"] = df["date"].dt.day
 
-    return df
+    return df.reset_index(drop=True)
+
+
+# 날짜(월, 일) → 0~365 슬롯 번호 (윤년 기준 366일)
+DAY_KEYS = [
+    (d.month, d.day)
+    for d in pd.date_range("2000-01-01", "2000-12-31")
+]
+
+DAY_SLOT = np.full((13, 32), -1)
+for slot, (m, d) in enumerate(DAY_KEYS):
+    DAY_SLOT[m, d] = slot
+
+# 추세 계산용 누적합 항목 (x = 연도 - 1900)
+SUM_FIELDS = [
+    "n", "sx", "sxx",
+    "max_sy", "max_syy", "max_sxy",
+    "min_sy", "min_syy", "min_sxy"
+]
+
+# 95% 예측구간에 쓰는 정규분포 분위수 (날짜별 표본이 100개 이상이라 t분포와 거의 같음)
+Z_95 = 1.96
+
+# 이어 붙이기 여부 판단에 쓰는 원본 끝부분 크기 (바이트)
+TAIL_BYTES = 4096
+
+# 디스크 세그먼트가 이 개수를 넘으면 하나로 합침
+MAX_SEGMENTS = 32
+
+
+class ClimateData:
+    """
+    한 시점의 기온 데이터 스냅샷 (세그먼트별 컬럼 배열 + 날짜별 인덱스 + 추세 누적합).
+    만든 뒤에는 바꾸지 않고, 새 행이 들어오면 appended()로 새 스냅샷을 만듭니다.
+    → 다른 세션은 잠금 없이 읽어도 항상 완성된 상태만 보게 됨
+
+    세그먼트는 디스크 캐시의 세그먼트와 1:1로 대응하며,
+    캐시에서 복원한 세그먼트는 메모리 매핑된 배열을 복사 없이 그대로 씀.
+    """
+
+    def __init__(self, segments=(), day_positions=None, sums=None):
+        # 세그먼트 목록: 각각 컬럼 → 배열
+        self.segments = list(segments)
+        lengths = [len(segment["date"]) for segment in self.segments]
+        # 세그먼트별 시작 행 위치 (전체 행 번호 → 세그먼트 찾기용)
+        self.starts = np.cumsum([0] + lengths[:-1], dtype=np.int64)
+        self.size = sum(lengths)
+        # 슬롯 → 연도순 행 위치 리스트 (전체 행 번호)
+        self.day_positions = day_positions if day_positions is not None else {}
+        self.sums = sums if sums is not None else np.zeros((len(SUM_FIELDS), len(DAY_KEYS)))
+        self.trends = fit_trends(self.sums)
+        # 세그먼트가 여러 개일 때 series()용으로 이어 붙인 배열 (처음 요청 때 한 번만)
+        self.joined = {}
+
+    # -----------------------------------
+    # 조회
+    # -----------------------------------
+    def day_rows(self, month, day):
+        """해당 (월, 일)의 행을 연도순으로 반환"""
+        slot = DAY_SLOT[month, day]
+        positions = self.day_positions.get(slot, [])
+        rows = np.asarray(positions, dtype=np.int64)
+
+        if not self.segments:
+            return pd.DataFrame(columns=CACHE_COLUMNS)
+
+        return pd.DataFrame({
+            col: self.take(col, rows)
+            for col in CACHE_COLUMNS
+        })
+
+    def series(self, col):
+        """전체 기간 (날짜, 값) 배열 — 원본 순서(날짜순), 세그먼트가 하나면 복사 없이 반환"""
+        return self._column("date"), self._column(col)
+
+    def take(self, col, rows):
+        """전체 행 번호 배열 → 해당 컬럼 값 (세그먼트별로 나눠서 가져옴)"""
+        if len(self.segments) == 1:
+            return self.segments[0][col][rows]
+
+        seg = np.searchsorted(self.starts, rows, side="right") - 1
+        out = np.empty(len(rows), dtype=self.segments[0][col].dtype)
+
+        for i in np.unique(seg):
+            mask = seg == i
+            out[mask] = self.segments[i][col][rows[mask] - self.starts[i]]
+
+        return out
+
+    def _column(self, col):
+        if len(self.segments) == 1:
+            return self.segments[0][col]
+
+        if col not in self.joined:
+            self.joined[col] = np.concatenate(
+                [segment[col] for segment in self.segments]
+            )
+        return self.joined[col]
+
+    # -----------------------------------
+    # 이어 붙이기 / 합치기 (새 스냅샷 생성)
+    # -----------------------------------
+    def appended(self, segment):
+        """새 세그먼트(컬럼 → 배열)를 반영한 스냅샷을 반환 (자기 자신은 그대로 둠)"""
+        k = len(segment["date"])
+        if k == 0:
+            return self
+
+        start = self.size
+        years = segment["year"]
+        slots = DAY_SLOT[segment["month"], segment["day"]]
+
+        # 추세 누적합: 새 행만 더함
+        x = years - 1900.0
+        y_max = segment["max_temp"].astype(float)
+        y_min = segment["min_temp"].astype(float)
+
+        weights = {
+            "n": None,
+            "sx": x,
+            "sxx": x * x,
+            "max_sy": y_max,
+            "max_syy": y_max * y_max,
+            "max_sxy": x * y_max,
+            "min_sy": y_min,
+            "min_syy": y_min * y_min,
+            "min_sxy": x * y_min
+        }
+
+        sums = self.sums + np.stack([
+            np.bincount(
+                slots,
+                weights=weights[field],
+                minlength=len(DAY_KEYS)
+            )
+            for field in SUM_FIELDS
+        ])
+
+        # 날짜별 인덱스는 아래에서 채움 (반환 전까지는 아무도 보지 않음)
+        day_positions = dict(self.day_positions)
+        data = ClimateData(self.segments + [segment], day_positions, sums)
+
+        # 날짜별 인덱스: 새 행 위치를 (슬롯, 연도) 순으로 묶어서 추가
+        # (바뀌는 슬롯만 새 리스트로 만들고 나머지는 이전 스냅샷과 공유)
+        order = np.lexsort((years, slots))
+        uniq, first = np.unique(slots[order], return_index=True)
+
+        for slot, chunk in zip(uniq, np.split(order + start, first[1:])):
+            old = day_positions.get(int(slot), [])
+            positions = old + chunk.tolist()
+            if old and data.take("year", np.array(old[-1:]))[0] > years[chunk[0] - start]:
+                # 예전 연도가 뒤늦게 추가된 경우만 연도순으로 다시 정렬
+                rows = np.asarray(positions, dtype=np.int64)
+                order_by_year = np.argsort(data.take("year", rows), kind="stable")
+                positions = rows[order_by_year].tolist()
+            day_positions[int(slot)] = positions
+
+        return data
+
+    def merged(self):
+        """모든 세그먼트를 하나로 합친 스냅샷 (행 번호·인덱스·누적합은 그대로)"""
+        if len(self.segments) <= 1:
+            return self
+
+        segment = {col: self._column(col) for col in CACHE_COLUMNS}
+        return ClimateData([segment], self.day_positions, self.sums)
+
+
+def frame_segment(frame):
+    """parse_csv 결과 → 세그먼트 (컬럼 → 배열)"""
+    return {col: frame[col].to_numpy() for col in CACHE_COLUMNS}
+
+
+class ClimateStore:
+    """
+    seoul.csv와 디스크 캐시를 관리하며 최신 ClimateData 스냅샷을 들고 있음.
+    seoul.csv 뒤에 새 행이 추가되면 추가된 부분만 읽어서 반영합니다.
+    """
+
+    def __init__(self, csv_path, cache_dir):
+        self.csv_path = csv_path
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+
+        # 지금까지 반영한 원본 상태 (크기, 수정시각, 끝부분 해시)
+        self.source = None
+        # 디스크 캐시의 세그먼트 이름 (파일: {컬럼}.{이름}.npy)
+        self.segments = []
+        # meta.json이 더 이상 가리키지 않게 되면 지울 옛 세그먼트 이름
+        self.stale = []
+
+        # 읽는 쪽은 이 속성을 한 번만 읽어서 씀 (갱신은 새 스냅샷으로 통째로 교체)
+        self.data = ClimateData()
+
+    # -----------------------------------
+    # 갱신
+    # -----------------------------------
+    def refresh(self):
+        """원본이 바뀌었으면 반영하고 최신 스냅샷 반환 (바뀌지 않았으면 stat 한 번으로 끝)"""
+        if self._is_current():
+            return self.data
+
+        with self.lock:
+            if self.source is None:
+                self._restore_cache()
+
+            if self._is_current():
+                return self.data
+
+            current = self._stat_key()
+
+            if self._is_append():
+                # 이어 붙은 부분만 파싱
+                with open(self.csv_path, "rb") as f:
+                    f.seek(self.source["size"])
+                    tail = f.read(current["size"] - self.source["size"])
+
+                frame = parse_csv(io.BytesIO(tail), header=None)
+                data = self.data.appended(frame_segment(frame))
+            else:
+                # 처음이거나 원본이 수정된 경우 → 옆에서 전체 다시 파싱
+                # (완성될 때까지 다른 세션은 이전 스냅샷을 계속 읽음)
+                self.stale += self.segments
+                self.segments = []
+                frame = parse_csv(self.csv_path)
+                data = ClimateData().appended(frame_segment(frame))
+
+            if len(frame) > 0:
+                data = self._save_segment(data)
+
+            # 완성된 스냅샷을 한 번의 대입으로 교체한 뒤 원본 상태 갱신
+            # → _is_current()가 참이면 self.data도 이미 새 스냅샷
+            self.data = data
+            self.source = self._source_info(current["size"])
+            self._save_meta()
+
+            return data
+
+    # -----------------------------------
+    # 원본 변경 감지
+    # -----------------------------------
+    def _stat_key(self):
+        stat = self.csv_path.stat()
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns
+        }
+
+    def _is_current(self):
+        if self.source is None:
+            return False
+
+        current = self._stat_key()
+        return (
+            self.source["size"] == current["size"]
+            and self.source["mtime_ns"] == current["mtime_ns"]
+        )
+
+    def _source_info(self, size):
+        with open(self.csv_path, "rb") as f:
+            f.seek(max(size - TAIL_BYTES, 0))
+            tail = f.read(size - f.tell())
+
+        info = self._stat_key()
+        info["size"] = size
+        info["tail_sha1"] = hashlib.sha1(tail).hexdigest()
+        return info
+
+    def _is_append(self):
+        """기존 내용은 그대로이고 뒤에 행만 추가되었는지 확인"""
+        if self.source is None:
+            return False
+
+        old_size = self.source["size"]
+        if self.csv_path.stat().st_size <= old_size:
+            return False
+
+        with open(self.csv_path, "rb") as f:
+            f.seek(max(old_size - TAIL_BYTES, 0))
+            tail = f.read(old_size - f.tell())
+
+        return (
+            tail.endswith(b"\n")
+            and hashlib.sha1(tail).hexdigest() == self.source.get("tail_sha1")
+        )
+
+    # -----------------------------------
+    # 디스크 캐시 (세그먼트별 .npy, 메모리 매핑)
+    # -----------------------------------
+    def _restore_cache(self):
+        """디스크 캐시가 있으면 파싱 없이 불러오기 (실패하면 무시)"""
+        try:
+            meta = json.loads(
+                (self.cache_dir / "meta.json").read_text(encoding="utf-8")
+            )
+
+            data = ClimateData()
+            for name in meta["segments"]:
+                # 메모리 매핑된 배열을 복사하지 않고 그대로 세그먼트로 사용
+                data = data.appended({
+                    col: np.load(
+                        self.cache_dir / f"{col}.{name}.npy",
+                        mmap_mode="r"
+                    )
+                    for col in CACHE_COLUMNS
+                })
+        except (OSError, ValueError, KeyError):
+            return
+
+        self.data = data
+        self.segments = meta["segments"]
+        self.source = meta["source"]
+
+    def _save_segment(self, data):
+        """마지막 세그먼트를 디스크에 저장하고, 저장한 모양대로의 스냅샷을 반환"""
+        if len(self.segments) >= MAX_SEGMENTS:
+            # 세그먼트가 너무 많으면 전체를 하나로 합쳐서 새 이름으로 저장
+            # (옛 세그먼트 파일은 새 meta.json이 기록될 때까지 그대로 둠
+            #  → 옛 meta.json을 읽은 다른 프로세스가 합친 파일과 섞어 읽지 않음)
+            self.stale += self.segments
+            self.segments = []
+            data = data.merged()
+
+        segment = data.segments[-1]
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # 세그먼트마다 새 이름 → 기존 파일을 덮어쓰지 않음
+            name = uuid.uuid4().hex[:12]
+            for col in CACHE_COLUMNS:
+                # 임시 파일에 쓴 뒤 교체 → 다른 프로세스가 반쯤 쓴 파일을 읽지 않음
+                tmp_path = self.cache_dir / f"{col}.{name}.npy.tmp"
+                with open(tmp_path, "wb") as f:
+                    np.save(f, segment[col])
+                os.replace(tmp_path, self.cache_dir / f"{col}.{name}.npy")
+        except OSError:
+            # 저장 실패 → 없는 이름이 기록되어 다음 복원 때 전체 다시 파싱
+            name = "missing"
+
+        self.segments.append(name)
+        return data
+
+    def _save_meta(self):
+        # meta.json은 마지막에 기록 → 세그먼트 파일이 모두 준비된 뒤에만 유효
+        try:
+            tmp_path = self.cache_dir / "meta.json.tmp"
+            tmp_path.write_text(
+                json.dumps({
+                    "source": self.source,
+                    "segments": self.segments
+                }),
+                encoding="utf-8"
+            )
+            os.replace(tmp_path, self.cache_dir / "meta.json")
+
+            # 새 meta.json이 가리키지 않는 옛 세그먼트 파일 정리
+            while self.stale:
+                name = self.stale.pop()
+                for col in CACHE_COLUMNS:
+                    (self.cache_dir / f"{col}.{name}.npy").unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+@st.cache_resource
+def load_store():
+    return ClimateStore(CSV_PATH, CACHE_DIR)
+
 
+# -----------------------------------
+# 날짜별 추세 모델 (전체 날짜 일괄 계산)
+# -----------------------------------
+def fit_trends(sums):
+    """누적합으로 모든 (월, 일)의 연도 → 기온 단순 선형회귀 계수를 한 번에 계산"""
+    s = dict(zip(SUM_FIELDS, sums))
+
+    n = s["n"]
+    valid = n > 0
+    safe_n = np.where(valid, n, 1)
+
+    x_mean = s["sx"] / safe_n
+    sxx = np.maximum(s["sxx"] - s["sx"] * x_mean, 0)
+
+    trends = {key: {} for key, ok in zip(DAY_KEYS, valid) if ok}
+
+    for target, prefix in [("max_temp", "max"), ("min_temp", "min")]:
+        y_mean = s[f"{prefix}_sy"] / safe_n
+        sxy = s[f"{prefix}_sxy"] - s["sx"] * y_mean
+        syy = s[f"{prefix}_syy"] - s[f"{prefix}_sy"] * y_mean
+
+        # 연도가 하나뿐인 날짜는 기울기 0 (평균값으로 예측)
+        slope = np.divide(
+            sxy,
+            sxx,
+            out=np.zeros_like(sxy),
+            where=sxx > 0
+        )
+
+        # 잔차 표준편차 (자유도 n - 2)
+        sse = np.maximum(syy - slope * sxy, 0)
+        dof = n - 2
+        sigma = np.sqrt(
+            np.divide(
+                sse,
+                dof,
+                out=np.full_like(sse, np.nan),
+                where=dof > 0
+            )
+        )
+
+        # 절편은 실제 연도 기준으로 환산
+        intercept = y_mean - slope * (x_mean + 1900)
+
+        for i, key in enumerate(DAY_KEYS):
+            if valid[i]:
+                trends[key][target] = (
+                    slope[i],
+                    intercept[i],
+                    x_mean[i] + 1900,
+                    sxx[i],
+                    sigma[i],
+                    n[i]
+                )
+
+    return trends
+
+
+def predict_trend(trend, year):
+    """추세 계수로 (예측값, 예측구간 하한, 상한) 계산"""
+    slope, intercept, x_mean, sxx, sigma, n = trend
 
-df = load_data()
+    pred = intercept + slope * year
+
+    if sxx > 0:
+        spread = np.sqrt(1 + 1 / n + (year - x_mean) ** 2 / sxx)
+    else:
+        spread = np.sqrt(1 + 1 / n)
+
+    margin = Z_95 * sigma * spread
+
+    return pred, pred - margin, pred + margin
+
+
+# -----------------------------------
+# 긴 시계열 그리기 (점 개수 제한)
+# -----------------------------------
+# 한 trace에 보내는 최대 점 개수 (전체 기간이 길어져도 이 이하로 유지)
+MAX_POINTS = 2000
+
+
+def downsample_minmax(x, y, max_points=MAX_POINTS):
+    """
+    구간별 최솟값/최댓값만 남겨서 점 개수를 max_points 이하로 줄이기.
+    (극값이 그대로 남아서 그래프 모양이 거의 바뀌지 않음)
+    """
+    n = len(y)
+    if n <= max_points:
+        return x, y
+
+    buckets = max_points // 2
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    bucket = np.repeat(np.arange(buckets), np.diff(edges))
+
+    y = np.asarray(y, dtype=float)
+    mins = np.minimum.reduceat(y, edges[:-1])
+    maxs = np.maximum.reduceat(y, edges[:-1])
+
+    # 구간마다 최솟값/최댓값이 처음 나오는 위치
+    min_pos = np.flatnonzero(y == mins[bucket])
+    max_pos = np.flatnonzero(y == maxs[bucket])
+    _, first_min = np.unique(bucket[min_pos], return_index=True)
+    _, first_max = np.unique(bucket[max_pos], return_index=True)
+
+    keep = np.union1d(min_pos[first_min], max_pos[first_max])
+
+    return np.asarray(x)[keep], y[keep]
+
+
+def make_trace(x, y, max_points=MAX_POINTS, **kwargs):
+    """점이 많으면 min/max 축소 + WebGL(Scattergl), 적으면 일반 Scatter"""
+    if len(y) > max_points:
+        x, y = downsample_minmax(x, y, max_points)
+        return go.Scattergl(x=x, y=y, **kwargs)
+
+    return go.Scatter(x=x, y=y, **kwargs)
+
+
+# 이번 실행 동안은 같은 스냅샷만 읽음 (다른 세션이 갱신해도 섞이지 않음)
+data = load_store().refresh()
 
 # -----------------------------------
 # 사용자 선택
@@ -92,15 +598,16 @@ day = st.sidebar.selectbox(
     index=0
 )
 
+show_daily = st.sidebar.checkbox(
+    "전체 기간 일별 그래프 보기",
+    value=False
+)
+
 # -----------------------------------
 # 데이터 필터링
 # -----------------------------------
-filtered = df[
-    (df["month"] == month) &
-    (df["day"] == day)
-].copy()
-
-filtered = filtered.sort_values("year")
+# 날짜별 인덱스로 해당 날짜의 행만 바로 가져오기 (이미 연도순 정렬됨)
+filtered = data.day_rows(month, day)
 
 # -----------------------------------
 # 데이터 없는 경우
@@ -116,9 +623,9 @@ fig = go.Figure()
 
 # 최고기온
 fig.add_trace(
-    go.Scatter(
-        x=filtered["year"],
-        y=filtered["max_temp"],
+    make_trace(
+        filtered["year"],
+        filtered["max_temp"],
         mode="lines+markers",
         name="최고기온",
         line=dict(
@@ -131,9 +638,9 @@ fig.add_trace(
 
 # 최저기온
 fig.add_trace(
-    go.Scatter(
-        x=filtered["year"],
-        y=filtered["min_temp"],
+    make_trace(
+        filtered["year"],
+        filtered["min_temp"],
         mode="lines+markers",
         name="최저기온",
         line=dict(
@@ -193,25 +700,11 @@ predict_year = st.slider(
     2035
 )
 
-# 학습 데이터
-X = filtered["year"].values.reshape(-1, 1)
-
-y_max = filtered["max_temp"].values
-y_min = filtered["min_temp"].values
+# 미리 학습된 추세 계수로 바로 예측
+trend = data.trends[(month, day)]
 
-# 모델 생성
-model_max = LinearRegression()
-model_min = LinearRegression()
-
-# 학습
-model_max.fit(X, y_max)
-model_min.fit(X, y_min)
-
-# 예측
-future = np.array([[predict_year]])
-
-pred_max = model_max.predict(future)[0]
-pred_min = model_min.predict(future)[0]
+pred_max, low_max, high_max = predict_trend(trend["max_temp"], predict_year)
+pred_min, low_min, high_min = predict_trend(trend["min_temp"], predict_year)
 
 # 결과 출력
 col3, col4 = st.columns(2)
@@ -228,6 +721,12 @@ with col4:
         f"{pred_min:.1f}℃"
     )
 
+if np.isfinite(low_max) and np.isfinite(low_min):
+    st.caption(
+        f"95% 예측구간 — 최고기온 {low_max:.1f}℃ ~ {high_max:.1f}℃, "
+        f"최저기온 {low_min:.1f}℃ ~ {high_min:.1f}℃"
+    )
+
 # -----------------------------------
 # 예측 그래프 추가
 # -----------------------------------
@@ -235,9 +734,9 @@ fig2 = go.Figure()
 
 # 기존 최고기온
 fig2.add_trace(
-    go.Scatter(
-        x=filtered["year"],
-        y=filtered["max_temp"],
+    make_trace(
+        filtered["year"],
+        filtered["max_temp"],
         mode="lines",
         name="실제 최고기온",
         line=dict(
@@ -249,9 +748,9 @@ fig2.add_trace(
 
 # 기존 최저기온
 fig2.add_trace(
-    go.Scatter(
-        x=filtered["year"],
-        y=filtered["min_temp"],
+    make_trace(
+        filtered["year"],
+        filtered["min_temp"],
         mode="lines",
         name="실제 최저기온",
         line=dict(
@@ -271,6 +770,14 @@ fig2.add_trace(
         marker=dict(
             color="red",
             size=14
+        ),
+        # 95% 예측구간
+        error_y=dict(
+            type="data",
+            symmetric=False,
+            array=[high_max - pred_max],
+            arrayminus=[pred_max - low_max],
+            color="red"
         )
     )
 )
@@ -285,6 +792,14 @@ fig2.add_trace(
         marker=dict(
             color="blue",
             size=14
+        ),
+        # 95% 예측구간
+        error_y=dict(
+            type="data",
+            symmetric=False,
+            array=[high_min - pred_min],
+            arrayminus=[pred_min - low_min],
+            color="blue"
         )
     )
 )
@@ -318,3 +833,58 @@ with st.expander("📄 데이터 보기"):
         ),
         use_container_width=True
     )
+
+# -----------------------------------
+# 전체 기간 일별 그래프
+# -----------------------------------
+if show_daily:
+    st.subheader("📈 전체 기간 일별 기온")
+
+    fig3 = go.Figure()
+
+    dates, max_values = data.series("max_temp")
+    _, min_values = data.series("min_temp")
+
+    fig3.add_trace(
+        make_trace(
+            dates,
+            max_values,
+            mode="lines",
+            name="최고기온",
+            line=dict(
+                color="hotpink",
+                width=1
+            )
+        )
+    )
+
+    fig3.add_trace(
+        make_trace(
+            dates,
+            min_values,
+            mode="lines",
+            name="최저기온",
+            line=dict(
+                color="#A7D8FF",
+                width=1
+            )
+        )
+    )
+
+    fig3.update_layout(
+        title="전체 기간 일별 최고/최저기온",
+        xaxis_title="날짜",
+        yaxis_title="온도(℃)",
+        template="plotly_white",
+        height=650
+    )
+
+    st.plotly_chart(
+        fig3,
+        use_container_width=True
+    )
+
+    st.caption(
+        f"전체 {len(dates):,}일 데이터를 구간별 최고/최저값 기준으로 "
+        f"최대 {MAX_POINTS:,}개 점으로 줄여서 표시합니다."
+    )
@@ -1,57 +1,414 @@
 import streamlit as st
-import pandas as pd
-import json, random, time
+import csv, json, random, secrets
+import io, os, threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
+from PIL import Image
+import numpy as np
 
 st.set_page_config(page_title="AI 타로 리딩", page_icon="🔮", layout="wide")
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 csv_path = BASE_DIR / "tarot_card_meanings.csv"
 json_path = BASE_DIR / "tarot-images.json"
+korean_json_path = BASE_DIR / "tarot-korean.json"
 image_dir = BASE_DIR / "images"
 
 CARD_BACK = image_dir / "card_back.jpg"
 CARD_BACK_CHOICE = image_dir / "card_back_choice.jpg"
 
+# 크기별로 줄인 카드 이미지(WebP)를 저장해 둘 폴더
+IMAGE_CACHE_DIR = BASE_DIR / ".cache" / "tarot"
+
+# 크기 등급 → 가로 폭(px): 선택 그리드(7열)는 thumb, 결과 카드(3열)는 display
+SIZE_CLASSES = {"thumb": 200, "display": 350}
+WEBP_QUALITY = 80
+
+# 메모리에 들고 있을 이미지 바이트 상한
+IMAGE_CACHE_BYTES = 16 * 1024 * 1024
+
+# 질문 유형 / 카드 방향 (해석 표의 축 순서)
+READING_TYPES = ["일반", "연애", "진로"]
+ORIENTATIONS = ["정방향", "역방향"]
+NO_MEANING = "해석 정보가 없습니다."
+
+# tarot_card_meanings.csv의 yes_or_no 값 → 화면 표시
+YES_NO_LABELS = {"Yes": "예", "No": "아니오", "Maybe": "글쎄요"}
+
+# 셔플해서 펼쳐 놓는 카드 수 (3줄 × 7장)
+DECK_ROWS, DECK_COLS = 3, 7
+DECK_SIZE = DECK_ROWS * DECK_COLS
+
+# 셔플 직후 카드가 내려앉는 애니메이션 (브라우저에서만 실행 → 서버는 기다리지 않음)
+SHUFFLE_CSS = """
+<style>
+@keyframes tarot-shuffle {
+    0%   { transform: translateY(-60px) rotate(-12deg); opacity: 0; }
+    60%  { transform: translateY(6px) rotate(3deg); opacity: 1; }
+    100% { transform: none; opacity: 1; }
+}
+[data-testid="stImage"] img { animation: tarot-shuffle 0.7s ease-out both; }
+""" + "\n".join(
+    # 열마다 조금씩 늦게 내려앉도록
+    f'[data-testid="stColumn"]:nth-child({i + 1}) [data-testid="stImage"] img, '
+    f'[data-testid="column"]:nth-child({i + 1}) [data-testid="stImage"] img '
+    f"{{ animation-delay: {i * 0.08:.2f}s; }}"
+    for i in range(DECK_COLS)
+) + "\n</style>"
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv(csv_path)
-    with open(json_path, encoding="utf-8") as f:
-        tarot_json = json.load(f)
-    return df, tarot_json
 
+# ======================
+# 카드 정보 (세 파일을 한 번만 합친 레지스트리)
+# ======================
+@dataclass(frozen=True)
+class TarotCard:
+    """카드 한 장의 정보 (화면에 필요한 값만 담은 가벼운 레코드)"""
 
-df, tarot_json = load_data()
+    __slots__ = (
+        "name", "name_ko", "img", "keywords", "questions",
+        "upright", "reversed", "love", "career", "yes_or_no", "has_meaning",
+    )
 
-image_map = {}
-card_info = {}
+    name: str
+    name_ko: str
+    img: str
+    keywords: tuple       # 한국어 키워드가 있으면 한국어
+    questions: tuple      # 한국어 질문이 있으면 한국어
+    upright: str
+    reversed: str
+    love: str
+    career: str
+    yes_or_no: str
+    has_meaning: bool     # tarot_card_meanings.csv에 해석이 있는지
+
+
+class CardRegistry:
+    """
+    카드 이름 → TarotCard (덱 순서는 tarot-images.json 순서)
+    - 해석 표: meanings[카드 번호, 방향, 질문 유형] → 해석 문장 (처음 한 번만 계산)
+    - 예/아니오 표: answers[카드 번호] → 예 / 아니오 / 글쎄요
+    """
+
+    def __init__(self, cards):
+        self.cards = {card.name: card for card in cards}
+        self.names = tuple(self.cards)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+
+        self.meanings = np.full(
+            (len(self.names), len(ORIENTATIONS), len(READING_TYPES)), NO_MEANING, dtype=object
+        )
+        self.answers = np.full(len(self.names), YES_NO_LABELS["Maybe"], dtype=object)
+
+        for i, card in enumerate(self.cards.values()):
+            if not card.has_meaning:
+                continue
+
+            # 일반: 방향에 따라 / 연애·진로: 방향과 상관없이 같은 해석
+            self.meanings[i, :, READING_TYPES.index("일반")] = [card.upright, card.reversed]
+            self.meanings[i, :, READING_TYPES.index("연애")] = card.love
+            self.meanings[i, :, READING_TYPES.index("진로")] = card.career
+            self.answers[i] = YES_NO_LABELS.get(card.yes_or_no, self.answers[i])
+
+    def __len__(self):
+        return len(self.cards)
+
+    def get(self, name):
+        return self.cards.get(name)
+
+
+def read_json_cards(path):
+    """json 파일의 카드 목록 → {이름: 카드 dict} (파일이 없으면 빈 dict)"""
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return {card["name"]: card for card in json.load(f)["cards"]}
+
+
+@st.cache_resource
+def load_registry():
+    """
+    tarot-images.json + tarot-korean.json + tarot_card_meanings.csv를
+    프로세스당 한 번만 합쳐서 카드 레지스트리 만들기 (모든 세션 공유, 읽기 전용)
+    """
+    base_cards = read_json_cards(json_path)
+    korean_cards = read_json_cards(korean_json_path)
+
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        meanings = {row["card_name"].strip(): row for row in csv.DictReader(f)}
+
+    cards = []
+    for name, card in base_cards.items():
+        card = {**card, **korean_cards.get(name, {})}
+        row = meanings.get(name, {})
+
+        cards.append(TarotCard(
+            name=name,
+            name_ko=card.get("name_ko", name),
+            img=card.get("img", ""),
+            keywords=tuple(card.get("keywords_ko") or card.get("keywords") or ()),
+            questions=tuple(card.get("questions_ko") or card.get("Questions to Ask") or ()),
+            upright=(row.get("upright_meaning") or "").strip(),
+            reversed=(row.get("reversed_meaning") or "").strip(),
+            love=(row.get("love_meaning") or "").strip(),
+            career=(row.get("career_meaning") or "").strip(),
+            yes_or_no=(row.get("yes_or_no") or "").strip(),
+            has_meaning=bool(row),
+        ))
+
+    return CardRegistry(cards)
 
-for card in tarot_json["cards"]:
-    image_map[card["name"]] = card["img"]
-    card_info[card["name"]] = card
 
-csv_info = {}
-for _, row in df.iterrows():
-    csv_info[str(row["card_name"]).strip()] = row
+# ======================
+# 카드 이미지 (크기별 WebP + 메모리 LRU)
+# ======================
+class CardImageCache:
+    """
+    (파일 이름, 크기 등급) → WebP 바이트
+    - 처음 한 번만 Pillow로 줄여서 디스크에 저장, 이후에는 저장본을 읽음
+    - 읽은 바이트는 오래 안 쓴 것부터 지우는 메모리 LRU에 보관
+    """
+
+    def __init__(self, image_dir, cache_dir, max_bytes):
+        self.image_dir = Path(image_dir)
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()  # key → 바이트
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, filename, size_class):
+        """크기 등급에 맞는 이미지 바이트 (원본이 없으면 None)"""
+        # 폭·화질까지 키에 포함 → 설정을 바꾸면 예전 변환본을 쓰지 않음
+        key = (filename, self._variant_name(size_class))
+
+        with self.lock:
+            data = self.items.get(key)
+            if data is not None:
+                self.items.move_to_end(key)
+                return data
+
+        data = self._load(filename, size_class)
+        if data is None:
+            return None
+
+        with self.lock:
+            if key not in self.items and len(data) <= self.max_bytes:
+                self.items[key] = data
+                self.total_bytes += len(data)
+
+                while self.total_bytes > self.max_bytes:
+                    _, old = self.items.popitem(last=False)
+                    self.total_bytes -= len(old)
+
+        return data
+
+    def pregenerate(self, filenames, size_classes=tuple(SIZE_CLASSES)):
+        """변환본을 미리 만들어 두기 (백그라운드 스레드에서 호출)"""
+        for filename in filenames:
+            for size_class in size_classes:
+                self.get(filename, size_class)
+
+    @staticmethod
+    def _variant_name(size_class):
+        # 예: 'thumb-200w-q80' — 폭이나 화질이 바뀌면 다른 폴더가 됨
+        return f"{size_class}-{SIZE_CLASSES[size_class]}w-q{WEBP_QUALITY}"
+
+    def _variant_path(self, filename, size_class):
+        return self.cache_dir / self._variant_name(size_class) / f"{Path(filename).stem}.webp"
+
+    def _load(self, filename, size_class):
+        src = self.image_dir / filename
+        if not src.exists():
+            return None
+
+        dst = self._variant_path(filename, size_class)
+        if dst.exists() and dst.stat().st_mtime_ns >= src.stat().st_mtime_ns:
+            return dst.read_bytes()
+
+        data = self._resize(src, SIZE_CLASSES[size_class])
+
+        # 저장 실패(읽기 전용 디스크 등)해도 메모리 캐시로는 동작
+        try:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dst.with_name(f"{dst.name}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, dst)
+        except OSError:
+            pass
+
+        return data
+
+    @staticmethod
+    def _resize(src, width):
+        with Image.open(src) as im:
+            im = im.convert("RGB")
+            if im.width > width:
+                height = round(im.height * width / im.width)
+                im = im.resize((width, height), Image.LANCZOS)
+
+            buf = io.BytesIO()
+            im.save(buf, format="WEBP", quality=WEBP_QUALITY)
+            return buf.getvalue()
+
+
+@st.cache_resource
+def get_card_images():
+    """이미지 캐시는 프로세스당 하나 (모든 세션 공유)"""
+    cache = CardImageCache(image_dir, IMAGE_CACHE_DIR, IMAGE_CACHE_BYTES)
+
+    # 카드 뒷면은 바로 쓰이니 먼저, 나머지 카드는 백그라운드에서 미리 변환
+    cache.pregenerate([CARD_BACK.name, CARD_BACK_CHOICE.name], ["thumb"])
+    filenames = [card.img for card in load_registry().cards.values() if card.img]
+    threading.Thread(target=cache.pregenerate, args=(filenames,), daemon=True).start()
+
+    return cache
+
+
+# ======================
+# 스프레드 (카드 배치 정의)
+# ======================
+@dataclass(frozen=True)
+class Spread:
+    """카드 배치 한 가지: 자리 이름 순서대로 카드를 고름"""
+
+    name: str
+    positions: tuple      # 자리 이름 (고르는 순서)
+    columns: int          # 결과 화면 한 줄에 놓을 카드 수
+    summary: str          # 종합 리딩 마지막 문장
+    yes_no: bool = False  # 예/아니오로 답하는 스프레드인지
+
+
+SPREADS = {
+    spread.name: spread
+    for spread in [
+        Spread(
+            name="3장 (과거·현재·미래)",
+            positions=("과거", "현재", "미래"),
+            columns=3,
+            summary="세 장의 카드는 현재의 흐름과 앞으로의 가능성을 보여줍니다.",
+        ),
+        Spread(
+            name="5장 (상황·장애물·조언)",
+            positions=("현재 상황", "장애물", "숨은 영향", "조언", "결과"),
+            columns=5,
+            summary="다섯 장의 카드는 상황을 가로막는 것과 풀어 갈 방향을 함께 보여줍니다.",
+        ),
+        Spread(
+            name="켈틱 크로스 (10장)",
+            positions=(
+                "현재 상황", "도전", "근본 원인", "가까운 과거", "목표",
+                "가까운 미래", "나 자신", "주변 환경", "희망과 두려움", "최종 결과",
+            ),
+            columns=5,
+            summary="열 장의 카드는 질문을 둘러싼 안팎의 흐름과 그 끝을 함께 보여줍니다.",
+        ),
+        Spread(
+            name="예/아니오 (1장)",
+            positions=("답",),
+            columns=3,
+            summary="한 장의 카드는 질문에 대한 지금의 기운을 보여줍니다.",
+            yes_no=True,
+        ),
+    ]
+}
+DEFAULT_SPREAD = next(iter(SPREADS))
+
+
+# ======================
+# 덱 엔진 (시드 하나로 리딩 전체가 정해짐)
+# ======================
+class TarotDeck:
+    """
+    시드로 섞은 덱: 카드 배열, 카드별 정/역방향, 질문 선택까지 모두 시드로 결정
+    - 같은 시드 → 같은 리딩 (URL의 ?seed=로 다시 보기 가능)
+    """
+
+    __slots__ = ("seed", "cards", "reversed", "index")
+
+    def __init__(self, seed, names, size=DECK_SIZE):
+        rng = random.Random(seed)
+        self.seed = seed
+        self.cards = tuple(rng.sample(list(names), size))
+        self.reversed = tuple(rng.random() < 0.5 for _ in self.cards)
+        self.index = {name: i for i, name in enumerate(self.cards)}
+
+    def orientation(self, card_name):
+        return ORIENTATIONS[self.orientation_ids([card_name])[0]]
+
+    def orientation_ids(self, card_names):
+        """카드 이름들 → 방향 번호 배열 (0: 정방향, 1: 역방향)"""
+        return np.array([self.reversed[self.index[name]] for name in card_names], dtype=np.intp)
+
+    def pick(self, card_name, options):
+        """카드마다 고정된 선택 (재실행해도 바뀌지 않음)"""
+        return random.Random(f"{self.seed}:{card_name}").choice(options)
+
+
+def save_reading_params():
+    """현재 리딩(질문 유형 + 스프레드 + 시드 + 고른 카드 위치)을 URL에 기록"""
+    deck = st.session_state.deck
+    st.query_params["type"] = str(READING_TYPES.index(st.session_state.reading_type))
+    st.query_params["spread"] = str(list(SPREADS).index(st.session_state.spread))
+    st.query_params["seed"] = str(deck.seed)
+    st.query_params["picks"] = ",".join(
+        str(deck.index[name]) for name in st.session_state.chosen_cards
+    )
+
+
+def restore_reading_params():
+    """URL의 ?type=&spread=&seed=&picks=로 리딩 복원 (잘못된 값이면 무시)"""
+    try:
+        reading_type = READING_TYPES[int(st.query_params.get("type", 0))]
+        spread = list(SPREADS)[int(st.query_params.get("spread", 0))]
+        seed = int(st.query_params["seed"])
+        picks = [int(i) for i in st.query_params.get("picks", "").split(",") if i]
+    except (KeyError, ValueError, IndexError):
+        return
+
+    deck = TarotDeck(seed, registry.names)
+    st.session_state.reading_type = reading_type
+    st.session_state.spread = spread
+    st.session_state.deck = deck
+    st.session_state.chosen_cards = [
+        deck.cards[i] for i in dict.fromkeys(picks) if 0 <= i < len(deck.cards)
+    ][:len(SPREADS[spread].positions)]
+
+
+registry = load_registry()
+card_images = get_card_images()
 
 
 # ======================
 # session state 초기화
 # ======================
-if "deck_cards" not in st.session_state:
-    st.session_state.deck_cards = None
+if "deck" not in st.session_state:
+    st.session_state.spread = DEFAULT_SPREAD
+    st.session_state.deck = None
+    st.session_state.chosen_cards = []
+    restore_reading_params()
 
 if "chosen_cards" not in st.session_state:
     st.session_state.chosen_cards = []
 
+# 세션마다 따로 쓰는 난수 생성기 (셔플 시드 발급용)
+if "rng" not in st.session_state:
+    st.session_state.rng = random.Random(secrets.randbits(64))
+
 
 # ======================
 # UI
 # ======================
 st.title("🔮 AI 타로 리딩")
 
-reading_type = st.selectbox("질문 유형", ["일반", "연애", "진로"])
+reading_type = st.selectbox("질문 유형", READING_TYPES, key="reading_type")
+
+spread_name = st.selectbox(
+    "스프레드",
+    list(SPREADS),
+    index=list(SPREADS).index(st.session_state.spread),
+    help="새로 셔플할 때 적용됩니다.",
+)
 
 question = st.text_area(
     "무엇이 궁금한가요?",
@@ -68,104 +425,124 @@ if st.button("🃏 카드 셔플 시작"):
         st.warning("질문을 입력해주세요.")
         st.stop()
 
-    with st.spinner("카드를 섞는 중..."):
-        time.sleep(2)
-
-    st.session_state.deck_cards = random.sample(
-        list(image_map.keys()), 21
-    )
+    seed = st.session_state.rng.getrandbits(32)
+    st.session_state.spread = spread_name
+    st.session_state.deck = TarotDeck(seed, registry.names)
     st.session_state.chosen_cards = []
+    st.session_state.just_shuffled = True
+    save_reading_params()
 
     st.rerun()
 
 
 # ======================
-# 카드 선택 UI
+# 카드 선택 UI (fragment: 선택 클릭 시 그리드만 다시 그림)
 # ======================
-if st.session_state.deck_cards:
+def spread_size():
+    return len(SPREADS[st.session_state.spread].positions)
 
-    st.divider()
-    st.subheader(f"카드를 선택하세요 ({len(st.session_state.chosen_cards)}/3)")
 
-    for row in range(3):
-        cols = st.columns(7)
+def choose_card(card_name):
+    """'선택' 버튼 콜백: 그리드를 그리기 전에 선택 상태를 먼저 반영"""
+    chosen = st.session_state.chosen_cards
+    if card_name not in chosen and len(chosen) < spread_size():
+        chosen.append(card_name)
+        save_reading_params()
+
+
+@st.fragment
+def card_grid():
+    deck = st.session_state.deck
+    chosen = st.session_state.chosen_cards
+    size = spread_size()
+
+    st.subheader(f"{st.session_state.spread} · 카드를 선택하세요 ({len(chosen)}/{size})")
+    st.caption(f"리딩 번호 #{deck.seed} · 주소를 저장해 두면 같은 리딩을 다시 볼 수 있어요.")
+
+    # 셔플 직후 한 번만 애니메이션
+    if st.session_state.pop("just_shuffled", False):
+        st.markdown(SHUFFLE_CSS, unsafe_allow_html=True)
+
+    for row in range(DECK_ROWS):
+        cols = st.columns(DECK_COLS)
 
-        for col in range(7):
+        for col in range(DECK_COLS):
 
-            idx = row * 7 + col
-            card_name = st.session_state.deck_cards[idx]
+            idx = row * DECK_COLS + col
+            card_name = deck.cards[idx]
 
             with cols[col]:
 
-                selected = card_name in st.session_state.chosen_cards
+                selected = card_name in chosen
                 img = CARD_BACK_CHOICE if selected else CARD_BACK
+                img_bytes = card_images.get(img.name, "thumb")
 
-                if img.exists():
-                    st.image(str(img), use_container_width=True)
+                if img_bytes is not None:
+                    st.image(img_bytes, use_container_width=True)
 
-                if (not selected) and len(st.session_state.chosen_cards) < 3:
+                # 고른 카드도 버튼을 지우지 않고 비활성화 → 칸 배치와 위젯 키가 그대로 유지
+                st.button(
+                    "선택",
+                    key=f"c{idx}",
+                    disabled=selected or len(chosen) >= size,
+                    on_click=choose_card,
+                    args=(card_name,),
+                )
 
-                    if st.button("선택", key=f"c{idx}"):
-                        st.session_state.chosen_cards.append(card_name)
-                        st.rerun()
+    # 마지막 카드를 고른 순간에만 페이지 전체를 다시 그려서 결과 패널 표시
+    if len(chosen) == size and st.session_state.app_picks != size:
+        st.rerun(scope="app")
 
 
-# ======================
-# 결과 출력
-# ======================
-if len(st.session_state.chosen_cards) == 3:
+# 페이지 전체 실행 때의 선택 수 (fragment만 다시 실행될 때는 바뀌지 않음)
+st.session_state.app_picks = len(st.session_state.chosen_cards)
 
+if st.session_state.deck:
     st.divider()
-    st.header("✨ 선택된 카드")
+    card_grid()
 
-    positions = ["과거", "현재", "미래"]
-    cols = st.columns(3)
-    summary = []
-
-    for i, card_name in enumerate(st.session_state.chosen_cards):
 
-        orientation = random.choice(["정방향", "역방향"])
-        csv_card = csv_info.get(card_name)
+# ======================
+# 결과 출력 (fragment: 그리드와 따로 그려짐)
+# ======================
+@st.fragment
+def reading_result(question, reading_type):
 
-        # -------------------------
-        # 의미 추출 (안전 처리)
-        # -------------------------
-        if csv_card is not None:
+    spread = SPREADS[st.session_state.spread]
+    chosen = st.session_state.chosen_cards
 
-            if reading_type == "연애":
-                meaning = str(csv_card.get("love_meaning", ""))
+    # 해석은 표에서 한 번에 꺼냄: meanings[카드 번호, 방향, 질문 유형]
+    card_ids = np.array([registry.ids[name] for name in chosen], dtype=np.intp)
+    orient_ids = st.session_state.deck.orientation_ids(chosen)
+    meanings = registry.meanings[card_ids, orient_ids, READING_TYPES.index(reading_type)]
 
-            elif reading_type == "진로":
-                meaning = str(csv_card.get("career_meaning", ""))
+    st.divider()
+    st.header("✨ 선택된 카드")
 
-            else:
-                if orientation == "정방향":
-                    meaning = str(csv_card.get("upright_meaning", ""))
-                else:
-                    meaning = str(csv_card.get("reversed_meaning", ""))
+    summary = []
 
-        else:
-            meaning = "해석 정보가 없습니다."
+    for start in range(0, len(chosen), spread.columns):
+        cols = st.columns(spread.columns)
 
-        with cols[i]:
+        for col, i in zip(cols, range(start, min(start + spread.columns, len(chosen)))):
 
-            st.subheader(positions[i])
+            card_name = chosen[i]
+            card = registry.get(card_name)
 
-            image_file = image_map.get(card_name)
-            image_path = image_dir / image_file if image_file else None
+            with col:
 
-            if image_path and image_path.exists():
-                st.image(str(image_path), use_container_width=True)
+                st.subheader(spread.positions[i])
 
-            card = card_info.get(card_name, {})
+                img_bytes = card_images.get(card.img, "display") if card.img else None
 
-            name_ko = card.get("name_ko", card_name)
+                if img_bytes is not None:
+                    st.image(img_bytes, use_container_width=True)
 
-            st.markdown(f"**{name_ko} ({card_name})**")
-            st.write(orientation)
-            st.info(meaning)
+                st.markdown(f"**{card.name_ko} ({card_name})**")
+                st.write(ORIENTATIONS[orient_ids[i]])
+                st.info(meanings[i])
 
-        summary.append(f"{positions[i]} : {meaning}")
+            summary.append(f"{spread.positions[i]} : {meanings[i]}")
 
 
     # ======================
@@ -174,16 +551,18 @@ if len(st.session_state.chosen_cards) == 3:
     st.divider()
     st.header("🔮 종합 리딩")
 
-    st.success(f"""
-질문 : {question}
+    if spread.yes_no:
+        answer = registry.answers[card_ids[0]]
+        summary.insert(0, f"**답 : {answer}**")
 
-{summary[0]}
+    summary_text = "\n\n".join(summary)
 
-{summary[1]}
+    st.success(f"""
+질문 : {question}
 
-{summary[2]}
+{summary_text}
 
-세 장의 카드는 현재의 흐름과 앞으로의 가능성을 보여줍니다.
+{spread.summary}
 """)
 
 
@@ -195,13 +574,10 @@ if len(st.session_state.chosen_cards) == 3:
     keywords = []
 
     for card_name in st.session_state.chosen_cards:
-        card = card_info.get(card_name, {})
-
-        if "keywords_ko" in card:
-            keywords.extend(card["keywords_ko"][:4])
+        card = registry.get(card_name)
 
-        elif "keywords" in card:
-            keywords.extend(card["keywords"][:4])
+        if card is not None:
+            keywords.extend(card.keywords[:4])
 
     keywords = list(dict.fromkeys(keywords))
 
@@ -216,17 +592,14 @@ if len(st.session_state.chosen_cards) == 3:
 
     for card_name in st.session_state.chosen_cards:
 
-        card = card_info.get(card_name, {})
+        card = registry.get(card_name)
 
-        if "questions_ko" in card:
-            q = card["questions_ko"]
-            if q:
-                st.markdown(f"- {random.choice(q)}")
-
-        elif "Questions to Ask" in card:
-            q = card["Questions to Ask"]
-            if q:
-                st.markdown(f"- {random.choice(q)}")
+        if card is not None and card.questions:
+            st.markdown(f"- {st.session_state.deck.pick(card_name, card.questions)}")
 
 
     st.caption("본 결과는 오락 및 자기성찰 목적으로만 활용하세요.")
+
+
+if st.session_state.deck and len(st.session_state.chosen_cards) == spread_size():
+    reading_result(question, reading_type)